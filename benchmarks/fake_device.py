@@ -0,0 +1,310 @@
+"""Local stand-in for a Wattrix device.
+
+Serves the HTTP API the integration uses and the status websocket on port
+8765. Every device binds its own loopback address (127.0.0.2, 127.0.0.3, ...)
+because the integration always connects the websocket to port 8765 of the
+device host.
+
+    python -m benchmarks.fake_device --devices 3 --latency 0.05 --error-rate 0.1
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from aiohttp import web
+
+_LOGGER = logging.getLogger(__name__)
+
+HTTP_PORT = 8080
+WEBSOCKET_PORT = 8765
+SCHEDULE_HOURS = 24 * 7
+MODES = ("EXPORT_SURPLUS_HEATING", "SOLAR_AND_GRID_HEATING", "UNRESTRICTED_HEATING", "DISABLED_HEATING", "TOTAL_STOP")
+
+
+def device_address(index: int) -> str:
+    return f"127.0.0.{index + 2}"
+
+
+class FakeWattrixDevice:
+    """One simulated device with configurable latency, jitter and failures."""
+
+    def __init__(self, address: str, http_port: int = HTTP_PORT, *, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, drop_rate: float = 0.0, push_interval: float = None,
+                 batch_sensors: bool = True, history_days: int = 30, seed=None):
+        self.address = address
+        self.http_port = http_port
+        self.latency = latency
+        self.jitter = jitter
+        # Podiel requestov, ktoré dostanú HTTP 503, a podiel zhodených spojení
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.push_interval = push_interval
+        self.batch_sensors = batch_sensors
+        self.history_days = history_days
+        self.requests = Counter()
+        self._random = random.Random(seed)
+        self._started = time.monotonic()
+        self._energy_at = time.monotonic()
+        self._websockets = set()
+        self._runners = []
+        self._push_task = None
+        self.serial_number = f"WTX{address.replace('.', '')}{http_port}"
+        self.state = {
+            "mode": "EXPORT_SURPLUS_HEATING",
+            "power_limit_percentage": 100,
+            "timeout_seconds": 900,
+            "setpoint": 200,
+            "target_temperature": 60,
+            "minimal_temperature": 40,
+            "temperature_recovery_delta": 2,
+            "current_power": 0,
+            "target_power": 0,
+            "temperature_sensor": 45.0,
+            "heating_override": False,
+            "version": "1.4.2",
+        }
+        self.active_power = 1200.0
+        self.energy_total_kwh = 1000.0
+        self.energy_today_kwh = 0.0
+        self.schedule_revision = 1
+        self.schedule = self._build_schedule()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.address}:{self.http_port}"
+
+    async def async_start(self) -> None:
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get("/status", self._status)
+        app.router.add_get("/sensors", self._sensors)
+        app.router.add_get("/sensors/{sensor_id}", self._sensor)
+        app.router.add_get("/serial-number", self._serial_number)
+        app.router.add_get("/version", self._version)
+        app.router.add_get("/device-info", self._device_info)
+        app.router.add_get("/schedule", self._schedule)
+        app.router.add_get("/history/energy", self._history)
+        app.router.add_post("/mode", self._mode)
+        await self._start_site(app, self.http_port)
+
+        ws_app = web.Application()
+        ws_app.router.add_get("/", self._websocket)
+        await self._start_site(ws_app, WEBSOCKET_PORT)
+
+        if self.push_interval:
+            self._push_task = asyncio.create_task(self._push_loop())
+
+    async def _start_site(self, app, port) -> None:
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, self.address, port).start()
+        self._runners.append(runner)
+
+    async def async_stop(self) -> None:
+        if self._push_task:
+            self._push_task.cancel()
+        for ws in list(self._websockets):
+            await ws.close()
+        for runner in self._runners:
+            await runner.cleanup()
+        self._runners.clear()
+
+    # --- simulácia ---
+
+    def _advance(self) -> None:
+        """Move the simulated power and energy counters to now."""
+        now = time.monotonic()
+        elapsed, self._energy_at = now - self._energy_at, now
+        if self.state["mode"] in ("DISABLED_HEATING", "TOTAL_STOP"):
+            self.active_power = 0.0
+        else:
+            limit = 3000 * self.state["power_limit_percentage"] / 100
+            self.active_power = min(max(self.active_power + self._random.uniform(-150, 150), 0.0), limit)
+        energy = self.active_power * elapsed / 3600 / 1000
+        self.energy_total_kwh += energy
+        self.energy_today_kwh += energy
+        self.state["current_power"] = round(self.active_power)
+        self.state["target_power"] = round(self.active_power)
+
+    def status(self) -> dict:
+        self._advance()
+        return {**self.state, "uptime": int(time.monotonic() - self._started)}
+
+    def sensor_values(self) -> dict:
+        self._advance()
+        return {
+            "energy_total_kwh": round(self.energy_total_kwh, 3),
+            "energy_today_kwh": round(self.energy_today_kwh, 3),
+            "heating_state": "TRUE" if self.active_power > 0 else "FALSE",
+            "active_power": round(self.active_power, 1),
+        }
+
+    def _build_schedule(self) -> list:
+        start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        return [
+            {
+                "start": (start + timedelta(hours=hour)).isoformat(),
+                "end": (start + timedelta(hours=hour + 1)).isoformat(),
+                "mode": MODES[hour % 3],
+                "power_limit_percentage": 100,
+            }
+            for hour in range(SCHEDULE_HOURS)
+        ]
+
+    def change_schedule(self) -> None:
+        """Change one slot, as when the cloud planner re-plans mid-day."""
+        slot = self._random.randrange(len(self.schedule))
+        self.schedule[slot] = {**self.schedule[slot], "mode": self._random.choice(MODES)}
+        self.schedule_revision += 1
+
+    async def async_push_status(self) -> None:
+        message = json.dumps(self.status())
+        for ws in list(self._websockets):
+            if not ws.closed:
+                await ws.send_str(message)
+
+    async def _push_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.push_interval)
+            await self.async_push_status()
+
+    # --- HTTP ---
+
+    @web.middleware
+    async def _middleware(self, request, handler):
+        self.requests[request.path] += 1
+        delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.drop_rate and self._random.random() < self.drop_rate:
+            request.transport.abort()
+            raise web.HTTPServiceUnavailable()
+        if self.error_rate and self._random.random() < self.error_rate:
+            raise web.HTTPServiceUnavailable()
+        return await handler(request)
+
+    async def _status(self, request):
+        return web.json_response(self.status())
+
+    async def _sensors(self, request):
+        if not self.batch_sensors:
+            raise web.HTTPNotFound()
+        values = self.sensor_values()
+        ids = [sensor_id for sensor_id in request.query.get("ids", "").split(",") if sensor_id in values]
+        return web.json_response({"sensors": [{"id": sensor_id, "value": values[sensor_id]} for sensor_id in ids]})
+
+    async def _sensor(self, request):
+        values = self.sensor_values()
+        sensor_id = request.match_info["sensor_id"]
+        if sensor_id not in values:
+            raise web.HTTPNotFound()
+        return web.json_response({"id": sensor_id, "value": values[sensor_id]})
+
+    async def _serial_number(self, request):
+        return web.json_response({"serial_number": self.serial_number})
+
+    async def _version(self, request):
+        return web.json_response({"version": self.state["version"]})
+
+    async def _device_info(self, request):
+        return web.json_response({"model": "Wattrix Fake", "thermal_sensor": round(self._random.uniform(35, 45), 1)})
+
+    async def _schedule(self, request):
+        etag = f'"{self.schedule_revision}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        if request.query.get("since_revision") == str(self.schedule_revision):
+            body = {"revision": self.schedule_revision, "changed": [], "removed": []}
+        else:
+            body = {"revision": self.schedule_revision, "schedule": self.schedule}
+        return web.json_response(body, headers={"ETag": etag})
+
+    async def _history(self, request):
+        """Hourly counter readings back to history_days, consistent with the live counter."""
+        self._advance()
+        limit = int(request.query.get("limit", 1000))
+        offset = int(request.query.get("cursor", 0))
+        now = datetime.now(timezone.utc)
+        since = max(datetime.fromisoformat(request.query["since"]), now - timedelta(days=self.history_days))
+        hours = int((now - since).total_seconds() // 3600)
+        entries = []
+        for index in range(offset, min(offset + limit, hours)):
+            moment = since + timedelta(hours=index, minutes=59)
+            age_hours = (now - moment).total_seconds() / 3600
+            entries.append({
+                "t": moment.isoformat(),
+                "energy_total_kwh": round(self.energy_total_kwh - age_hours * 1.2, 3),
+            })
+        next_cursor = str(offset + limit) if offset + limit < hours else None
+        return web.json_response({"entries": entries, "next_cursor": next_cursor})
+
+    async def _mode(self, request):
+        payload = await request.json()
+        for key, value in payload.items():
+            if key in self.state and value is not None:
+                self.state[key] = value
+        await self.async_push_status()
+        return web.json_response(self.status())
+
+    async def _websocket(self, request):
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+        self._websockets.add(ws)
+        try:
+            await ws.send_str(json.dumps(self.status()))
+            async for message in ws:
+                if message.type == web.WSMsgType.TEXT:
+                    await self._handle_ws_message(json.loads(message.data))
+        finally:
+            self._websockets.discard(ws)
+        return ws
+
+    async def _handle_ws_message(self, message) -> None:
+        # Setpoint regulácie: prevezme sa a potvrdí pushnutým statusom
+        if message.get("type") == "setpoint" and message.get("value") is not None:
+            self.requests["ws:setpoint"] += 1
+            self.state["setpoint"] = message["value"]
+            await self.async_push_status()
+
+
+async def async_start_devices(count: int, **options) -> list:
+    devices = [FakeWattrixDevice(device_address(index), **options) for index in range(count)]
+    await asyncio.gather(*(device.async_start() for device in devices))
+    return devices
+
+
+async def _async_main(args) -> None:
+    devices = await async_start_devices(
+        args.devices, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        drop_rate=args.drop_rate, push_interval=args.push_interval,
+    )
+    for device in devices:
+        print(f"{device.serial_number}: {device.base_url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        for device in devices:
+            await device.async_stop()
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run fake Wattrix devices on loopback addresses.")
+    parser.add_argument("--devices", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0, help="base response delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="uniform +- delay in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 503")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="share of connections dropped")
+    parser.add_argument("--push-interval", type=float, default=None, help="seconds between websocket pushes")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_async_main(_parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,272 @@
+"""Replay recorded Wattrix traffic into the coordinators on a virtual clock.
+
+Recordings come from the wattrix.record_traffic service. Every recording
+becomes one config entry; its HTTP requests are answered from the recording
+(the latest recorded answer for the path and query at the current virtual
+time) and its websocket events and disconnects are delivered at their
+recorded times. The clock is frozen and advanced in steps, so an hour of
+traffic replays in seconds; the report gives CPU time per coordinator update
+and state writes per hour.
+
+    python -m benchmarks.replay wattrix_traffic_WTX1_20260101120000.jsonl.gz --step 1
+"""
+import argparse
+import asyncio
+import bisect
+import json
+import logging
+import sys
+import time
+from datetime import timedelta
+from unittest.mock import patch
+from urllib.parse import urlparse
+
+import aiohttp
+from freezegun import freeze_time
+from homeassistant import loader
+from homeassistant.const import EVENT_STATE_CHANGED, EVENT_STATE_REPORTED
+from homeassistant.helpers import entity_registry as er
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+    async_test_home_assistant,
+)
+
+from custom_components.wattrix.fleet import WattrixFleet
+from custom_components.wattrix.traffic import read_traffic, request_key
+
+from .run import REPO_ROOT
+
+_LOGGER = logging.getLogger(__name__)
+
+DOMAIN = "wattrix"
+
+
+class TrafficReplayer:
+    """Answers requests and emits websocket events of one recording."""
+
+    def __init__(self, header, events, clock):
+        self.header = header
+        self._clock = clock
+        self._match_query = header.get("version", 1) >= 2
+        self._http = {}
+        self._ws = []
+        for event in events:
+            if event[0] == "h":
+                _kind, ms, _endpoint, method, path, status, etag, body, error = event
+                self._http.setdefault((method, path), []).append((ms, status, etag, body, error))
+            else:
+                self._ws.append(event)
+        self._http_times = {key: [answer[0] for answer in answers] for key, answers in self._http.items()}
+        self._ws_index = 0
+        self.initially_connected = bool(self._ws) and not (self._ws[0][0] == "c" and self._ws[0][2])
+        self.duration_ms = max([event[1] for event in events], default=0)
+
+    def answer(self, method, path, params=None):
+        # Nahrávky verzie 1 nemajú query string - zhoda len podľa cesty
+        key = (method, request_key(path, params) if self._match_query else path)
+        answers = self._http.get(key)
+        if not answers:
+            return None
+        index = bisect.bisect_right(self._http_times[key], self._clock()) - 1
+        return answers[max(index, 0)]
+
+    def due_ws_events(self) -> list:
+        now = self._clock()
+        due = []
+        while self._ws_index < len(self._ws) and self._ws[self._ws_index][1] <= now:
+            due.append(self._ws[self._ws_index])
+            self._ws_index += 1
+        return due
+
+
+class ReplayResponse:
+    def __init__(self, status, etag, body):
+        self.status = status
+        self.headers = {"ETag": etag} if etag else {}
+        self._body = body.encode() if body is not None else b""
+        self.content_type = "application/json" if body and body[:1] in ("{", "[") else "text/plain"
+
+    async def read(self):
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class ReplaySession:
+    """Stands in for the fleet aiohttp session."""
+
+    closed = False
+
+    def __init__(self, replayers):
+        self._replayers = replayers
+
+    def request(self, method, url, params=None, headers=None, json=None, timeout=None, trace_request_ctx=None):
+        parsed = urlparse(url)
+        if trace_request_ctx is not None:
+            trace_request_ctx.connection_attempted = True
+        answer = self._replayers[parsed.hostname].answer(method, parsed.path, params)
+        if answer is None:
+            return ReplayResponse(404, None, None)
+        _ms, status, etag, body, error = answer
+        if error == "timeout":
+            raise asyncio.TimeoutError()
+        if error is not None:
+            raise aiohttp.ClientConnectionError(error)
+        if etag and (headers or {}).get("If-None-Match") == etag:
+            return ReplayResponse(304, etag, None)
+        return ReplayResponse(status, etag, body)
+
+    async def close(self):
+        pass
+
+
+class ReplayWebSocketClient:
+    """Replaces WattrixWebSocketClient; events are fed by the replay driver.
+
+    Recorded events were already coalesced by the live client, so they are
+    handed to the coordinator one by one without a queue of their own.
+    """
+
+    instances = {}
+
+    def __init__(self, hass, host, on_event_callback, on_connect_callback=None, on_disconnect_callback=None):
+        self._on_event_callback = on_event_callback
+        self._on_connect_callback = on_connect_callback
+        self._on_disconnect_callback = on_disconnect_callback
+        self.queue = asyncio.Queue()
+        self.connected = False
+        self.instances[host] = self
+
+    async def async_run(self):
+        while True:
+            await self.listen()
+
+    async def listen(self):
+        while (item := await self.queue.get()) != ("c", True):
+            pass
+        self.connected = True
+        if self._on_connect_callback:
+            self._on_connect_callback()
+        while (item := await self.queue.get()) != ("c", False):
+            if item[0] == "w":
+                await self._on_event_callback(item[1])
+        self.connected = False
+        if self._on_disconnect_callback:
+            self._on_disconnect_callback()
+        return True
+
+    async def async_send(self, payload) -> bool:
+        # Nahrávka neobsahuje odpovede na odoslané správy
+        return self.connected
+
+    def as_dict(self) -> dict:
+        return {"connected": self.connected, "pending": self.queue.qsize()}
+
+
+async def async_replay(paths, step: float) -> dict:
+    recordings = [read_traffic(path) for path in paths]
+    start = min(dt_util.parse_datetime(header["started"]) for header, _events in recordings)
+    with freeze_time(start) as frozen:
+        def clock_for(header):
+            offset = (dt_util.parse_datetime(header["started"]) - start).total_seconds() * 1000
+            return lambda: (dt_util.utcnow() - start).total_seconds() * 1000 - offset
+
+        replayers = {
+            f"replay-{index}.invalid": TrafficReplayer(header, events, clock_for(header))
+            for index, (header, events) in enumerate(recordings)
+        }
+        duration = max(replayer.duration_ms for replayer in replayers.values()) / 1000
+        session = ReplaySession(replayers)
+
+        with patch.object(WattrixFleet, "session", property(lambda _fleet: session)), \
+                patch("custom_components.wattrix.helpers.WattrixWebSocketClient", ReplayWebSocketClient):
+            async with async_test_home_assistant(config_dir=str(REPO_ROOT)) as hass:
+                hass.data.pop(loader.DATA_CUSTOM_COMPONENTS, None)
+                await async_setup_component(hass, "recorder", {"recorder": {"db_url": "sqlite://"}})
+                entries = [
+                    MockConfigEntry(domain=DOMAIN, title="Wattrix replay", data={"host": f"http://{host}"})
+                    for host in replayers
+                ]
+                for entry in entries:
+                    entry.add_to_hass(hass)
+                    await hass.config_entries.async_setup(entry.entry_id)
+                await hass.async_block_till_done()
+                for host, replayer in replayers.items():
+                    if replayer.initially_connected:
+                        ReplayWebSocketClient.instances[host].queue.put_nowait(("c", True))
+
+                return await _async_drive(hass, entries, replayers, frozen, duration, step)
+
+
+async def _async_drive(hass, entries, replayers, frozen, duration, step) -> dict:
+    registry = er.async_get(hass)
+    entity_ids = {
+        entity.entity_id
+        for entry in entries
+        for entity in er.async_entries_for_config_entry(registry, entry.entry_id)
+    }
+    counters = {"writes": 0, "updates": 0}
+
+    def _count_write(event):
+        if event.data.get("entity_id") in entity_ids:
+            counters["writes"] += 1
+
+    def _count_update():
+        counters["updates"] += 1
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _count_write)
+    hass.bus.async_listen(EVENT_STATE_REPORTED, _count_write)
+    for entry in entries:
+        hass.data[DOMAIN][entry.entry_id]["coordinator"].async_add_listener(_count_update)
+
+    wall_started = time.perf_counter()
+    cpu_started = time.process_time()
+    elapsed = 0.0
+    while elapsed < duration:
+        frozen.tick(timedelta(seconds=step))
+        elapsed += step
+        for host, replayer in replayers.items():
+            client = ReplayWebSocketClient.instances.get(host)
+            for event in replayer.due_ws_events():
+                if client is not None:
+                    client.queue.put_nowait(("w", event[2]) if event[0] == "w" else ("c", event[2]))
+        async_fire_time_changed(hass, dt_util.utcnow())
+        await hass.async_block_till_done()
+    cpu = time.process_time() - cpu_started
+    wall = time.perf_counter() - wall_started
+
+    for entry in entries:
+        await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    hours = duration / 3600 or 1
+    return {
+        "recordings": len(replayers),
+        "virtual_s": round(duration),
+        "wall_s": round(wall, 2),
+        "speedup": round(duration / wall) if wall else None,
+        "updates": counters["updates"],
+        "cpu_ms_per_update": round(cpu * 1000 / counters["updates"], 3) if counters["updates"] else None,
+        "state_writes_per_hour": round(counters["writes"] / hours / len(replayers)),
+    }
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Replay recorded Wattrix traffic on a virtual clock.")
+    parser.add_argument("recordings", nargs="+")
+    parser.add_argument("--step", type=float, default=1.0, help="virtual seconds per step")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    args = _parse_args()
+    print(json.dumps(asyncio.run(async_replay(args.recordings, args.step))))
+    sys.exit(0)
@@ -0,0 +1,236 @@
+"""Benchmark the integration against fake Wattrix devices.
+
+Sets up 1, 10 and 100 config entries in a test Home Assistant instance, each
+pointing at its own fake device, and measures setup time, per-poll latency,
+requests per device per hour, state writes per poll and memory per device.
+Every run is appended to benchmarks/results.jsonl and compared with the last
+run of the same configuration, so regressions show up before a release.
+
+    pip install -r benchmarks/requirements.txt
+    python -m benchmarks.run --devices 1,10,100 --duration 120 --latency 0.02 --jitter 0.01
+"""
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from homeassistant import loader
+from homeassistant.const import EVENT_STATE_CHANGED, EVENT_STATE_REPORTED
+from homeassistant.helpers import entity_registry as er
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_test_home_assistant
+
+from .fake_device import async_start_devices
+
+_LOGGER = logging.getLogger(__name__)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RESULTS_FILE = Path(__file__).resolve().parent / "results.jsonl"
+DOMAIN = "wattrix"
+# Všetky metriky sú "menej je lepšie"
+METRICS = (
+    "setup_s",
+    "poll_latency_p50_ms",
+    "poll_latency_p95_ms",
+    "requests_per_device_hour",
+    "state_writes_per_poll",
+    "memory_per_device_kib",
+)
+
+
+def _percentile(samples, percentile):
+    if not samples:
+        return None
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(round(percentile / 100 * (len(samples) - 1))))]
+
+
+async def async_benchmark(count: int, args) -> dict:
+    devices = await async_start_devices(
+        count, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, drop_rate=args.drop_rate,
+        push_interval=args.push_interval,
+    )
+    try:
+        async with async_test_home_assistant(config_dir=str(REPO_ROOT)) as hass:
+            # Povolí načítanie custom_components z koreňa repozitára
+            hass.data.pop(loader.DATA_CUSTOM_COMPONENTS, None)
+            await async_setup_component(hass, "recorder", {"recorder": {"db_url": "sqlite://"}})
+            entries = [MockConfigEntry(domain=DOMAIN, title="Wattrix", data={"host": device.base_url}) for device in devices]
+            for entry in entries:
+                entry.add_to_hass(hass)
+
+            gc.collect()
+            tracemalloc.start()
+            memory_before = tracemalloc.get_traced_memory()[0]
+            started = time.perf_counter()
+            for entry in entries:
+                await hass.config_entries.async_setup(entry.entry_id)
+            await hass.async_block_till_done()
+            setup_s = time.perf_counter() - started
+            gc.collect()
+            memory_per_device = (tracemalloc.get_traced_memory()[0] - memory_before) / count
+            tracemalloc.stop()
+
+            result = await _async_measure_steady_state(hass, entries, devices, args.duration)
+
+            for entry in entries:
+                await hass.config_entries.async_unload(entry.entry_id)
+            await hass.async_block_till_done()
+    finally:
+        await asyncio.gather(*(device.async_stop() for device in devices))
+
+    return {
+        "devices": count,
+        "setup_s": round(setup_s, 3),
+        "memory_per_device_kib": round(memory_per_device / 1024, 1),
+        **result,
+    }
+
+
+async def _async_measure_steady_state(hass, entries, devices, duration) -> dict:
+    registry = er.async_get(hass)
+    entity_ids = {
+        entity.entity_id
+        for entry in entries
+        for entity in er.async_entries_for_config_entry(registry, entry.entry_id)
+    }
+    counters = {"writes": 0, "polls": 0}
+
+    def _count_write(event):
+        if event.data.get("entity_id") in entity_ids:
+            counters["writes"] += 1
+
+    def _count_poll():
+        counters["polls"] += 1
+
+    for device in devices:
+        device.requests.clear()
+    coordinators = [hass.data[DOMAIN][entry.entry_id]["coordinator"] for entry in entries]
+    # Latencie zo setupu sa nerátajú
+    for coordinator in coordinators:
+        for endpoint in ("status", "sensors"):
+            coordinator.host.metrics.get(endpoint).latencies.clear()
+
+    unsubscribers = [
+        hass.bus.async_listen(EVENT_STATE_CHANGED, _count_write),
+        hass.bus.async_listen(EVENT_STATE_REPORTED, _count_write),
+    ]
+    unsubscribers.extend(coordinator.async_add_listener(_count_poll) for coordinator in coordinators)
+    started = time.perf_counter()
+    await asyncio.sleep(duration)
+    elapsed = time.perf_counter() - started
+    for unsubscribe in unsubscribers:
+        unsubscribe()
+
+    latencies = [
+        latency
+        for coordinator in coordinators
+        for endpoint in ("status", "sensors")
+        for latency in coordinator.host.metrics.get(endpoint).latencies
+    ]
+    requests = sum(sum(device.requests.values()) for device in devices)
+    p50, p95 = _percentile(latencies, 50), _percentile(latencies, 95)
+    return {
+        "poll_latency_p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+        "poll_latency_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+        "requests_per_device_hour": round(requests / len(devices) / elapsed * 3600),
+        "state_writes_per_poll": round(counters["writes"] / counters["polls"], 2) if counters["polls"] else None,
+        "polls": counters["polls"],
+    }
+
+
+def _config_key(args) -> dict:
+    return {
+        "duration": args.duration,
+        "latency": args.latency,
+        "jitter": args.jitter,
+        "error_rate": args.error_rate,
+        "drop_rate": args.drop_rate,
+        "push_interval": args.push_interval,
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _previous_results(config) -> dict:
+    """Latest earlier result per device count for the same configuration."""
+    previous = {}
+    if not RESULTS_FILE.exists():
+        return previous
+    for line in RESULTS_FILE.read_text().splitlines():
+        record = json.loads(line)
+        if record.get("config") == config:
+            for result in record["results"]:
+                previous[result["devices"]] = result
+    return previous
+
+
+def _regressions(result, previous, threshold) -> list:
+    regressions = []
+    for metric in METRICS:
+        old, new = previous.get(metric), result.get(metric)
+        if old and new is not None and new > old * (1 + threshold):
+            regressions.append(f"{metric} {old} -> {new}")
+    return regressions
+
+
+async def _async_main(args) -> int:
+    config = _config_key(args)
+    previous = _previous_results(config)
+    results = []
+    failed = False
+    for count in args.devices:
+        _LOGGER.info("Benchmarking %s device(s) for %s s", count, args.duration)
+        result = await async_benchmark(count, args)
+        results.append(result)
+        regressions = _regressions(result, previous.get(count, {}), args.threshold)
+        print(json.dumps(result))
+        for regression in regressions:
+            failed = True
+            print(f"  REGRESSION ({count} devices): {regression}")
+
+    if args.record:
+        record = {
+            "timestamp": dt_util.utcnow().isoformat(),
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "config": config,
+            "results": results,
+        }
+        with RESULTS_FILE.open("a") as file:
+            file.write(json.dumps(record) + "\n")
+    return 1 if failed and args.fail_on_regression else 0
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Wattrix integration against fake devices.")
+    parser.add_argument("--devices", type=lambda value: [int(part) for part in value.split(",")], default=[1, 10, 100])
+    parser.add_argument("--duration", type=float, default=60, help="steady-state measurement in seconds")
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--push-interval", type=float, default=None)
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative change reported as a regression")
+    parser.add_argument("--no-record", dest="record", action="store_false", help="do not append to results.jsonl")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(asyncio.run(_async_main(_parse_args())))
@@ -5,62 +5,121 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers.entity_registry import async_get as async_get_entity_registry
 
-from custom_components.wattrix.helpers import WattrixDataUpdateCoordinator, get_device_serial
+from custom_components.wattrix.backfill import WattrixEnergyBackfill
+from custom_components.wattrix.command_pipeline import WattrixCommandPipeline
+from custom_components.wattrix.energy import WattrixEnergyIntegrator
+from custom_components.wattrix.fleet import async_get_fleet
+from custom_components.wattrix.helpers import WattrixDataUpdateCoordinator
+from custom_components.wattrix.services import async_setup_services
+from custom_components.wattrix.setpoint_stream import WattrixSetpointStream
+from custom_components.wattrix.storage import WattrixStore
 from custom_components.wattrix.wattrix_host import WattrixHost
 
 DOMAIN = "wattrix"
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS = ["sensor", "select", "number"]
+PLATFORMS = ["sensor", "number", "select", "button"]
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up Wattrix from YAML (optional)."""
+    await async_setup_services(hass)
     return True
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Wattrix from a config entry."""
     hass.data.setdefault(DOMAIN, {})
 
-    host = entry.data["host"]
-    serial_number = await get_device_serial(host)
+    fleet = async_get_fleet(hass)
+    host = WattrixHost(hass, entry.data["host"], fleet)
+    store = WattrixStore(hass, entry.entry_id)
+    await store.async_load()
+
+    # Jeden paralelny bootstrap, zdielany vsetkymi platformami
+    try:
+        bootstrap = await host.async_get_bootstrap(store.identity)
+    except Exception as e:
+        if not store.identity.get("serial_number") or store.snapshot is None:
+            # Log warning and return False so HA will retry later
+            _LOGGER.warning("Wattrix not available during startup: %s", e)
+            return False  # HA will retry setup automatically later
+        # Zariadenie je offline, ale poznáme ho - pokračujeme s posledným známym stavom
+        _LOGGER.warning("Wattrix not available during startup, using last known state: %s", e)
+        bootstrap = {
+            "serial_number": store.identity.get("serial_number"),
+            "version": store.identity.get("version"),
+            "device_info": None,
+            "status": None,
+            "identity_cached": [name for name in ("serial_number", "version") if store.identity.get(name)],
+        }
+
+    serial_number = (bootstrap["serial_number"] or {}).get("serial_number")
     if serial_number and len(serial_number) > 0:
         _LOGGER.info("Using serial number: %s", serial_number)
     else:
         _LOGGER.error("No serial number found for Wattrix device.")
         return False
 
-    host = WattrixHost(hass, host)
+    coordinator = WattrixDataUpdateCoordinator(hass, host, entry, store, fleet)
+    if not coordinator.async_restore_snapshot(store.snapshot) and bootstrap["status"] is None:
+        _LOGGER.warning("Wattrix not available and the last known state is too old")
+        await fleet.async_unregister(entry.entry_id)
+        return False
+    coordinator.async_apply_bootstrap(bootstrap)
 
-    coordinator = WattrixDataUpdateCoordinator(hass, host)
-    try:
-        await coordinator.async_refresh()
-    except Exception as e:
-        # Log warning and return False so HA will retry later
-        _LOGGER.warning("Wattrix not available during startup: %s", e)
-        return False  # HA will retry setup automatically later
+    serial_number_old = bootstrap["serial_number"]
+    await migrate_unique_ids(hass, DOMAIN, serial_number_old, serial_number)
 
+    coordinator.async_start_push()
+    entry.async_on_unload(coordinator.async_stop_push)
+    entry.async_on_unload(entry.add_update_listener(async_options_updated))
 
-    serial_number_old = await host.async_get_serial_number()
-    await migrate_unique_ids(hass, DOMAIN, serial_number_old, serial_number)
+    commands = WattrixCommandPipeline(hass, host, coordinator)
+    entry.async_on_unload(commands.async_shutdown)
+
+    # Rýchla cesta pre setpoint regulácie cez websocket, mimo POST /mode
+    setpoint_stream = WattrixSetpointStream(hass, coordinator)
+    entry.async_on_unload(setpoint_stream.async_start())
+    entry.async_on_unload(setpoint_stream.async_shutdown)
 
+    # Lokálna integrácia výkonu do hodinových štatistík
+    energy = WattrixEnergyIntegrator(hass, coordinator, store)
+    entry.async_on_unload(energy.async_start())
+    entry.async_on_unload(energy.async_save)
 
     hass.data[DOMAIN][entry.entry_id] = {
         "host": host,
         "coordinator": coordinator,
+        "store": store,
+        "commands": commands,
+        "setpoint_stream": setpoint_stream,
+        "energy": energy,
+        "backfill": WattrixEnergyBackfill(hass, host, energy, store),
+        "serial_number": serial_number,
+        "bootstrap": bootstrap,
     }
 
-    # Forward setup to sensor and select platforms
-    await hass.config_entries.async_forward_entry_setups(entry,  ["sensor", "number", "select", "button"])
+    # Forward setup to all platforms
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     return True
 
+async def async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options to the running coordinator."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    coordinator.async_set_poll_intervals(entry.options)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+        await async_get_fleet(hass).async_unregister(entry.entry_id)
     return unload_ok
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove persisted data when the config entry is deleted."""
+    await WattrixStore(hass, entry.entry_id).async_remove()
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry."""
     await async_unload_entry(hass, entry)
@@ -0,0 +1,109 @@
+import asyncio
+import logging
+from datetime import timedelta
+
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from .energy import HOUR, RECONCILE_TOLERANCE_KWH, async_import_energy, hour_start
+
+_LOGGER = logging.getLogger(__name__)
+
+HISTORY_PAGE_SIZE = 1000
+# Bez checkpointu a zadaného začiatku siahneme takto ďaleko do histórie
+DEFAULT_BACKFILL_DAYS = 90
+
+
+class WattrixEnergyBackfill:
+    """Imports the device's stored counter history into the hourly energy statistics.
+
+    Each hour's sum is the last counter reading within that hour plus the
+    offset the live integrator had for that stretch of the counter: readings
+    before a counter reset get the current offset minus the resets after
+    them, so backfilled and live hours line up. Those resets are only known
+    once the history has been read up to now, so the pages are read once and
+    the hours are imported together afterwards, followed by the checkpoint.
+    Re-importing an hour overwrites it, which makes the backfill idempotent.
+    """
+
+    def __init__(self, hass, host, integrator, store):
+        self._hass = hass
+        self._host = host
+        self._integrator = integrator
+        self._store = store
+        self._lock = asyncio.Lock()
+
+    async def async_run(self, start=None, restart: bool = False) -> dict:
+        if self._lock.locked():
+            raise HomeAssistantError("Energy backfill is already running")
+        async with self._lock:
+            return await self._async_run(start, restart)
+
+    async def _async_run(self, start, restart) -> dict:
+        metadata = self._integrator.metadata
+        if metadata is None:
+            raise HomeAssistantError("Integrated energy sensor is not set up yet")
+
+        checkpoint = {} if restart else dict(self._store.backfill)
+        if start is not None:
+            since = hour_start(start)
+        elif checkpoint.get("hour"):
+            since = dt_util.parse_datetime(checkpoint["hour"]) + HOUR
+        else:
+            since = hour_start(dt_util.utcnow() - timedelta(days=DEFAULT_BACKFILL_DAYS))
+        # Aktuálnu hodinu (a všetko po nej) zapisuje živý integrátor
+        until = self._integrator.current_hour or hour_start(dt_util.utcnow())
+
+        # Jediný prechod históriou až po súčasnosť: posledné čítanie každej hodiny
+        # a počet vynulovaní počítadla pred ním
+        hours = {}
+        resets = []
+        last_value = None
+        pages = 0
+        async for readings in self._async_pages(since):
+            pages += 1
+            for moment, value in readings:
+                if last_value is not None and value < last_value - RECONCILE_TOLERANCE_KWH:
+                    _LOGGER.info("Wattrix energy counter reset in history at %s", moment)
+                    resets.append(last_value)
+                last_value = value
+                hour = hour_start(moment)
+                if since <= hour < until:
+                    hours[hour] = (value, len(resets))
+
+        # after[i] = súčet vynulovaní od i-teho po súčasnosť; úsek pred nimi má o toľko menší posun
+        after = [0.0]
+        for before in reversed(resets):
+            after.append(after[-1] + before)
+        after.reverse()
+        offset = self._integrator.offset_kwh
+        rows = [(hour, value + offset - after[index]) for hour, (value, index) in hours.items()]
+
+        last_hour = checkpoint.get("hour")
+        if rows:
+            async_import_energy(self._hass, metadata, rows)
+            last_hour = rows[-1][0].isoformat()
+        # Checkpoint až po importe - pokračovanie nikdy nepreskočí neimportovanú hodinu
+        self._store.async_set_backfill({"since": since.isoformat(), "hour": last_hour})
+
+        _LOGGER.info("Wattrix energy backfill imported %s hours from %s pages", len(rows), pages)
+        return {"imported_hours": len(rows), "pages": pages, "checkpoint": last_hour,
+                "counter_resets": len(resets), "complete": True}
+
+    async def _async_pages(self, since):
+        """Yield the readings of every history page; readings are (moment, counter kWh)."""
+        cursor = None
+        while True:
+            page = await self._host.async_get_energy_history(since, cursor, HISTORY_PAGE_SIZE)
+            if page is None:
+                raise HomeAssistantError("The device firmware keeps no energy history")
+            readings = []
+            for entry in page.get("entries", []):
+                moment = dt_util.parse_datetime(entry.get("t") or "")
+                value = entry.get("energy_total_kwh")
+                if moment is not None and isinstance(value, (int, float)):
+                    readings.append((dt_util.as_utc(moment), value))
+            yield readings
+            cursor = page.get("next_cursor")
+            if not cursor:
+                return
@@ -7,14 +7,14 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from custom_components.wattrix import DOMAIN
-from custom_components.wattrix.helpers import get_device_serial
 
 _LOGGER = logging.getLogger(__name__)
 
 class WattrixModeReapplyButton(ButtonEntity):
-    def __init__(self, host, coordinator: DataUpdateCoordinator,  serial_number, name: str = "Re-apply Wattrix Mode") -> None:
+    def __init__(self, host, coordinator: DataUpdateCoordinator, commands, serial_number, name: str = "Re-apply Wattrix Mode") -> None:
         self._coordinator = coordinator
         self._host = host
+        self._commands = commands
         self._attr_name = name
         self._attr_icon = "mdi:reload"
         self._attr_unique_id = f"wattrix_mode_reapply_{serial_number}"
@@ -28,14 +28,14 @@ class WattrixModeReapplyButton(ButtonEntity):
     async def _call_wattrix_api(self, mode: str):
 
         try:
-            raw_mode = self._coordinator.data.get("raw_mode_to_set", mode)
-            target_temperature = self._coordinator.data.get("target_temperature_to_set", None)
+            raw_mode = self._coordinator.staged.get("raw_mode_to_set", mode)
+            target_temperature = self._coordinator.staged.get("target_temperature_to_set", None)
 
-            power_limit_percentage = self._coordinator.data.get("power_limit_percentage_to_set", 100.0)
-            timeout_seconds = self._coordinator.data.get("timeout_seconds_to_set", 0)
-            setpoint = self._coordinator.data.get("setpoint_to_set", None)
-            minimal_temperature = self._coordinator.data.get("minimal_temperature_to_set", None)
-            temperature_recovery_delta = self._coordinator.data.get("minimal_temperature_recovery_delta_to_set", None)
+            power_limit_percentage = self._coordinator.staged.get("power_limit_percentage_to_set", 100.0)
+            timeout_seconds = self._coordinator.staged.get("timeout_seconds_to_set", 0)
+            setpoint = self._coordinator.staged.get("setpoint_to_set", None)
+            minimal_temperature = self._coordinator.staged.get("minimal_temperature_to_set", None)
+            temperature_recovery_delta = self._coordinator.staged.get("minimal_temperature_recovery_delta_to_set", None)
 
             _LOGGER.debug(f"Calling Wattrix API with: mode={raw_mode}, "
                           f"power_limit_percentage={power_limit_percentage}, "
@@ -44,11 +44,11 @@ class WattrixModeReapplyButton(ButtonEntity):
                           f"timeout_seconds={timeout_seconds}"
                           f", setpoint={setpoint}")
 
-            success = await self._host.async_set_mode(
-                raw_mode,
-                power_limit_percentage,
-                timeout_seconds,
-                setpoint,
+            success = await self._commands.async_set_mode(
+                mode = raw_mode,
+                power_limit_percentage = power_limit_percentage,
+                timeout_seconds = timeout_seconds,
+                setpoint = setpoint,
                 target_temperature = target_temperature,
                 minimal_temperature = minimal_temperature,
                 temperature_recovery_delta = None
@@ -57,7 +57,6 @@ class WattrixModeReapplyButton(ButtonEntity):
 
             if success:
                 _LOGGER.info(f"Wattrix mode successfully set to {raw_mode}")
-                await self._coordinator.async_request_refresh()
                 return True
             else:
                 _LOGGER.warning(f"Wattrix mode change to {raw_mode} failed without exception.")
@@ -73,15 +72,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     try:
         host = hass.data[DOMAIN][entry.entry_id]["host"]
         coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+        commands = hass.data[DOMAIN][entry.entry_id]["commands"]
+        serial_number = hass.data[DOMAIN][entry.entry_id]["serial_number"]
 
-        serial_number = await get_device_serial(host._base_url)
-        if serial_number and len(serial_number) > 0:
-            _LOGGER.info("Using serial number: %s", serial_number)
-        else:
-            _LOGGER.error("No serial number found for Wattrix device.")
-            return False
-
-        refresh_button = WattrixModeReapplyButton(host, coordinator, serial_number)
+        refresh_button = WattrixModeReapplyButton(host, coordinator, commands, serial_number)
 
         async_add_entities([refresh_button])
 
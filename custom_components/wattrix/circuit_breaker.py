@@ -0,0 +1,101 @@
+import logging
+import random
+import time
+
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# Po toľkých zlyhaniach za sebou sa breaker otvorí
+FAILURE_THRESHOLD = 3
+PROBE_BACKOFF_MIN = 5
+PROBE_BACKOFF_MAX = 300
+
+
+class WattrixCircuitBreaker:
+    """Fails requests fast while a device is unreachable and lets one probe through at a time."""
+
+    def __init__(self, name: str):
+        self._name = name
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self.rejected = 0
+        self._backoff = PROBE_BACKOFF_MIN
+        self._next_probe = None
+        self.opened_at = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.state != STATE_CLOSED
+
+    @property
+    def probing(self) -> bool:
+        return self.state == STATE_HALF_OPEN
+
+    def _probe_due(self) -> bool:
+        return self.state == STATE_OPEN and time.monotonic() >= self._next_probe
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be queued; while open only when the probe is due."""
+        if self.state == STATE_CLOSED or self._probe_due():
+            return True
+        self.rejected += 1
+        return False
+
+    def acquire(self) -> bool:
+        """Take the slot right before the request is sent; while open this is the single probe."""
+        if self.state == STATE_CLOSED:
+            return True
+        if self._probe_due():
+            self.state = STATE_HALF_OPEN
+            return True
+        self.rejected += 1
+        return False
+
+    def release_probe(self) -> None:
+        """End a probe that got neither an answer nor a failure; the next probe is due at once."""
+        if self.state == STATE_HALF_OPEN:
+            self.state = STATE_OPEN
+
+    def seconds_until_probe(self) -> float:
+        if self.state == STATE_CLOSED or self._next_probe is None:
+            return 0
+        return max(self._next_probe - time.monotonic(), 0)
+
+    def record_success(self) -> None:
+        if self.state != STATE_CLOSED:
+            _LOGGER.info("Wattrix %s is reachable again, closing circuit breaker", self._name)
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self._backoff = PROBE_BACKOFF_MIN
+        self._next_probe = None
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self.state == STATE_HALF_OPEN:
+            # Probe zlyhal - ďalší skúsime neskôr
+            self._backoff = min(self._backoff * 2, PROBE_BACKOFF_MAX)
+            self._open()
+        elif self.state == STATE_CLOSED and self.consecutive_failures >= FAILURE_THRESHOLD:
+            _LOGGER.warning("Wattrix %s unreachable, opening circuit breaker", self._name)
+            self.opened_at = dt_util.utcnow()
+            self._open()
+
+    def _open(self) -> None:
+        self.state = STATE_OPEN
+        # Jitter, aby sa offline zariadenia neskúšali naraz
+        self._next_probe = time.monotonic() + self._backoff * random.uniform(0.8, 1.2)
+
+    def as_dict(self) -> dict:
+        return {
+            "circuit_breaker": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "rejected_requests": self.rejected,
+            "offline_since": self.opened_at.isoformat() if self.opened_at else None,
+            "next_probe_in_s": round(self.seconds_until_probe(), 1) if self.is_open else None,
+        }
@@ -0,0 +1,121 @@
+import logging
+import time
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+# Zmeny prijaté v tomto okne sa pošlú jedným POST /mode
+COMMAND_DEBOUNCE_SECONDS = 0.5
+# Ako dlho čakať na potvrdenie režimu cez websocket, kým spravíme refresh
+PUSH_ACK_TIMEOUT = 5
+
+
+class WattrixCommandPipeline:
+    """Coalesces mode commands of one device into ordered, debounced POST /mode calls."""
+
+    def __init__(self, hass, host, coordinator):
+        self._hass = hass
+        self._host = host
+        self._coordinator = coordinator
+        self._pending = {}
+        self._waiters = []
+        self._first_submitted = None
+        self._unsub_timer = None
+        self._flushing = False
+        self._confirm_task = None
+
+    async def async_set_mode(self, **changes) -> bool:
+        """Queue a mode change and wait until the consolidated command was sent.
+
+        Fields changed again before the flush are overwritten (last writer wins).
+        """
+        if not self._pending:
+            self._first_submitted = time.monotonic()
+        self._pending.update(changes)
+        waiter = self._hass.loop.create_future()
+        self._waiters.append(waiter)
+        self._schedule_flush()
+        return await waiter
+
+    @callback
+    def _schedule_flush(self) -> None:
+        # Počas odosielania sa časovač nenastavuje, nastaví ho až koniec flushu - drží to poradie
+        if self._unsub_timer is None and not self._flushing:
+            self._unsub_timer = async_call_later(self._hass, COMMAND_DEBOUNCE_SECONDS, self._async_timer_fired)
+
+    async def _async_timer_fired(self, _now) -> None:
+        self._unsub_timer = None
+        await self._async_flush()
+
+    async def _async_flush(self) -> None:
+        self._flushing = True
+        try:
+            payload, self._pending = self._pending, {}
+            waiters, self._waiters = self._waiters, []
+            submitted = self._first_submitted
+            result = False
+            try:
+                if not payload:
+                    result = True
+                    return
+
+                _LOGGER.debug("Sending coalesced Wattrix command from %s callers: %s", len(waiters), payload)
+                state = await self._host.async_set_mode(**payload)
+                if state is None:
+                    return
+
+                self._coordinator.async_boost_polling()
+                if state.get("mode") is not None:
+                    # Odpoveď nesie autoritatívny stav - žiadny ďalší round-trip
+                    self._coordinator.async_apply_status(state)
+                    self._record_confirmed(submitted)
+                else:
+                    # Potvrdenie beží samostatne, ďalšie príkazy naň nečakajú
+                    self._confirm_task = self._hass.async_create_task(
+                        self._async_confirm(payload.get("mode"), submitted)
+                    )
+                result = True
+            finally:
+                self._resolve(waiters, result)
+        finally:
+            self._flushing = False
+            # Príkazy prijaté počas odosielania idú ďalším POST
+            if self._pending or self._waiters:
+                self._schedule_flush()
+
+    async def _async_confirm(self, mode, submitted) -> None:
+        """Wait for the device to report the new mode, over the websocket if possible."""
+        if self._coordinator.push_connected and await self._coordinator.async_wait_for_push(
+            lambda data: data.get("mode") == mode, PUSH_ACK_TIMEOUT
+        ):
+            self._record_confirmed(submitted)
+            return
+
+        await self._coordinator.async_request_refresh()
+        if self._coordinator.data.get("mode") == mode:
+            self._record_confirmed(submitted)
+
+    def _record_confirmed(self, submitted) -> None:
+        if submitted is not None:
+            self._host.metrics.get("mode_confirm").record_success(time.monotonic() - submitted, 0, dt_util.utcnow())
+
+    @staticmethod
+    def _resolve(waiters, result) -> None:
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(result)
+
+    @callback
+    def async_shutdown(self) -> None:
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        if self._confirm_task is not None:
+            self._confirm_task.cancel()
+            self._confirm_task = None
+        self._pending = {}
+        waiters, self._waiters = self._waiters, []
+        self._resolve(waiters, False)
@@ -1,8 +1,21 @@
 import voluptuous as vol
 from homeassistant import config_entries
-from homeassistant.helpers import aiohttp_client
+from homeassistant.core import callback
 import logging
 
+from .const import (
+    CONF_BATCH_SENSORS,
+    CONF_DEVICE_INFO_INTERVAL,
+    CONF_SCHEDULE_INTERVAL,
+    CONF_SENSORS_INTERVAL,
+    CONF_STATUS_INTERVAL,
+    DEFAULT_DEVICE_INFO_INTERVAL,
+    DEFAULT_SCHEDULE_INTERVAL,
+    DEFAULT_SENSORS_INTERVAL,
+    DEFAULT_STATUS_INTERVAL,
+)
+from .wattrix_host import WattrixHost
+
 _LOGGER = logging.getLogger(__name__)
 
 DOMAIN = "wattrix"
@@ -11,6 +24,9 @@ CONFIG_SCHEMA = vol.Schema({
     vol.Required("host"): str
 })
 
+# Interval pollovania v sekundách
+INTERVAL_SCHEMA = vol.All(vol.Coerce(int), vol.Range(min=5, max=3600))
+
 _LOGGER.info("WattrixConfigFlow loaded")
 
 class WattrixConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -20,6 +36,11 @@ class WattrixConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     def __init__(self):
         self._host = None
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        return WattrixOptionsFlow(config_entry)
+
     async def async_step_user(self, user_input=None):
         _LOGGER.warning("async_step_user called!")
 
@@ -29,13 +50,10 @@ class WattrixConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             self._host = user_input["host"]
 
             # Tu môžeš otestovať pripojenie k API Wattrix
+            # Rovnaký connection pool ako neskôr integrácia
             try:
-                session = aiohttp_client.async_get_clientsession(self.hass)
-                async with session.get(f"{self._host}/version") as response:
-                    if response.status != 200:
-                        errors["base"] = f"cannot_connect ({response.status})"
-                    else:
-                        return self.async_create_entry(title="Wattrix", data=user_input)
+                await WattrixHost(self.hass, self._host).async_get_version()
+                return self.async_create_entry(title="Wattrix", data=user_input)
             except Exception as e:
                 errors["base"] = "cannot_connect"
                 _LOGGER.error(f"Error connecting to Wattrix API: {e}", exc_info=True)
@@ -45,4 +63,26 @@ class WattrixConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             step_id="user",
             data_schema=CONFIG_SCHEMA,
             errors=errors
-        )
\ No newline at end of file
+        )
+
+
+class WattrixOptionsFlow(config_entries.OptionsFlow):
+    def __init__(self, config_entry):
+        self._config_entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        # Zmeny sa prejavia pri ďalšom update, bez reloadu
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self._config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema({
+                vol.Optional(CONF_BATCH_SENSORS, default=options.get(CONF_BATCH_SENSORS, False)): bool,
+                vol.Optional(CONF_STATUS_INTERVAL, default=options.get(CONF_STATUS_INTERVAL, DEFAULT_STATUS_INTERVAL)): INTERVAL_SCHEMA,
+                vol.Optional(CONF_SENSORS_INTERVAL, default=options.get(CONF_SENSORS_INTERVAL, DEFAULT_SENSORS_INTERVAL)): INTERVAL_SCHEMA,
+                vol.Optional(CONF_DEVICE_INFO_INTERVAL, default=options.get(CONF_DEVICE_INFO_INTERVAL, DEFAULT_DEVICE_INFO_INTERVAL)): INTERVAL_SCHEMA,
+                vol.Optional(CONF_SCHEDULE_INTERVAL, default=options.get(CONF_SCHEDULE_INTERVAL, DEFAULT_SCHEDULE_INTERVAL)): INTERVAL_SCHEMA,
+            }),
+        )
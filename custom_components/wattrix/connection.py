@@ -0,0 +1,91 @@
+import logging
+
+import aiohttp
+
+_LOGGER = logging.getLogger(__name__)
+
+MAX_CONNECTIONS = 32
+# Vstavaný HTTP server zariadenia občas odmietne paralelné spojenie - requesty idú jedným keep-alive spojením
+CONNECTIONS_PER_HOST = 1
+# Spojenie držíme dlhšie ako najdlhší bežný interval /status, aby sa handshake neopakoval
+KEEPALIVE_SECONDS = 75
+DNS_CACHE_SECONDS = 300
+
+CONNECT_TIMEOUT = 3
+DEFAULT_READ_TIMEOUT = 5
+# Timeout čítania podľa typu requestu; celkový čas ohraničuje deadline koordinátora
+READ_TIMEOUTS = {
+    "probe": 2,
+    "status": 5,
+    "sensors": 3,
+    "device_info": 5,
+    "schedule": 10,
+    "history": 15,
+    "mode": 5,
+    "serial_number": 3,
+    "version": 3,
+}
+DEFAULT_REQUEST_DEADLINE = 10
+# Celkový čas requestu od chvíle, keď mu patrí spojenie zariadenia; čakanie vo fronte sa nezapočítava
+REQUEST_DEADLINES = {
+    "probe": 5,
+    "status": 10,
+    "sensors": 5,
+    "device_info": 10,
+    "schedule": 15,
+    "history": 30,
+    "mode": 10,
+    "serial_number": 10,
+    "version": 10,
+}
+
+
+class RequestTrace:
+    """Per-request state filled in by the session's trace hooks."""
+
+    __slots__ = ("connection_attempted",)
+
+    def __init__(self):
+        # False, kým request len čaká na voľné spojenie v poole
+        self.connection_attempted = False
+
+
+async def _on_connection(_session, trace_config_ctx, _params) -> None:
+    trace = trace_config_ctx.trace_request_ctx
+    if isinstance(trace, RequestTrace):
+        trace.connection_attempted = True
+
+
+def _trace_config() -> aiohttp.TraceConfig:
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_connection_create_start.append(_on_connection)
+    trace_config.on_connection_reuseconn.append(_on_connection)
+    return trace_config
+
+
+def create_session() -> aiohttp.ClientSession:
+    """Create the session tuned for Wattrix devices; the fleet owns and closes it."""
+    connector = aiohttp.TCPConnector(
+        limit=MAX_CONNECTIONS,
+        limit_per_host=CONNECTIONS_PER_HOST,
+        keepalive_timeout=KEEPALIVE_SECONDS,
+        use_dns_cache=True,
+        ttl_dns_cache=DNS_CACHE_SECONDS,
+        enable_cleanup_closed=True,
+    )
+    return aiohttp.ClientSession(
+        connector=connector, timeout=request_timeout(None), trace_configs=[_trace_config()]
+    )
+
+
+def request_deadline(endpoint) -> float:
+    return REQUEST_DEADLINES.get(endpoint, DEFAULT_REQUEST_DEADLINE)
+
+
+def request_timeout(endpoint) -> aiohttp.ClientTimeout:
+    # connect by zahŕňal aj čakanie na voľné spojenie v poole, preto sa obmedzuje len samotný handshake
+    return aiohttp.ClientTimeout(
+        total=None,
+        sock_connect=CONNECT_TIMEOUT,
+        sock_read=READ_TIMEOUTS.get(endpoint, DEFAULT_READ_TIMEOUT),
+    )
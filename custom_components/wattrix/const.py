@@ -1 +1,20 @@
 DOMAIN = "wattrix"
+
+DATA_FLEET = f"{DOMAIN}_fleet"
+
+WEBSOCKET_PORT = 8765
+# Strop backoffu pri opätovnom pripájaní websocketu
+WEBSOCKET_RETRY_SECONDS = 30
+
+CONF_BATCH_SENSORS = "batch_sensors"
+CONF_STATUS_INTERVAL = "status_interval"
+CONF_SENSORS_INTERVAL = "sensors_interval"
+CONF_DEVICE_INFO_INTERVAL = "device_info_interval"
+CONF_SCHEDULE_INTERVAL = "schedule_interval"
+
+DEFAULT_STATUS_INTERVAL = 15
+DEFAULT_SENSORS_INTERVAL = 15
+DEFAULT_DEVICE_INFO_INTERVAL = 60
+DEFAULT_SCHEDULE_INTERVAL = 60
+# Identita sa po načítaní nepolluje, interval platí len pre opakovanie po chybe
+DEFAULT_IDENTITY_INTERVAL = 15
@@ -0,0 +1,33 @@
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+TO_REDACT = {"host"}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict:
+    """Return diagnostics for a Wattrix config entry."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    coordinator = entry_data["coordinator"]
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": str(coordinator.update_interval),
+            "push_connected": coordinator.push_connected,
+            "push": coordinator.push_stats,
+            "restored": coordinator.restored,
+            "data_age_s": coordinator.data_age,
+            "stale_keys": sorted(coordinator.stale_keys),
+            "schedule_revision": coordinator.schedule_revision or coordinator.schedule_hash,
+        },
+        "data": coordinator.data.as_dict(),
+        "staged": coordinator.staged.as_dict(),
+        "metrics": coordinator.host.metrics.as_dict(dt_util.utcnow()),
+        "circuit_breaker": coordinator.host.breaker.as_dict(),
+        "setpoint_stream": entry_data["setpoint_stream"].as_dict(),
+    }
@@ -0,0 +1,240 @@
+import logging
+from datetime import timedelta
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+ENERGY_UNIT = "kWh"
+# Dlhšiu medzeru medzi vzorkami neintegrujeme - doplní ju zosúladenie s počítadlom zariadenia
+MAX_SAMPLE_GAP = timedelta(minutes=15)
+# Odchýlka od počítadla zariadenia, ktorú ešte tolerujeme (rozlíšenie počítadla)
+RECONCILE_TOLERANCE_KWH = 0.2
+# Najviac toľko hodín v jednom volaní async_add_external_statistics
+IMPORT_BATCH_SIZE = 500
+
+HOUR = timedelta(hours=1)
+
+
+def hour_start(moment):
+    return dt_util.as_utc(moment).replace(minute=0, second=0, microsecond=0)
+
+
+def _trapezoid_kwh(t0, p0, t1, p1) -> float:
+    return (p0 + p1) / 2 * (t1 - t0).total_seconds() / 3600 / 1000
+
+
+@callback
+def async_import_energy(hass, metadata, rows) -> None:
+    """Import (hour start, cumulative kWh) rows into long-term statistics in bounded batches."""
+    for index in range(0, len(rows), IMPORT_BATCH_SIZE):
+        batch = rows[index:index + IMPORT_BATCH_SIZE]
+        async_add_external_statistics(
+            hass,
+            metadata,
+            [StatisticData(start=start, state=total, sum=total) for start, total in batch],
+        )
+
+
+def energy_statistic_id(serial_number) -> str:
+    """External statistic of one device; it belongs to no entity, so the recorder never compiles or repairs it."""
+    return f"{DOMAIN}:{slugify(str(serial_number))}_energy"
+
+
+def energy_metadata(statistic_id, name) -> StatisticMetaData:
+    return StatisticMetaData(
+        has_mean=False,
+        has_sum=True,
+        name=name,
+        source=DOMAIN,
+        statistic_id=statistic_id,
+        unit_of_measurement=ENERGY_UNIT,
+    )
+
+
+class WattrixEnergyIntegrator:
+    """Integrates active power into hourly energy and imports finished hours as long-term statistics.
+
+    The cumulative sum is anchored to the device counter `energy_total_kwh` and
+    reconciled with it at every hour boundary, so it never drifts away.
+    """
+
+    def __init__(self, hass, coordinator, store=None):
+        self._hass = hass
+        self._coordinator = coordinator
+        self._store = store
+        state = store.energy if store is not None else {}
+        # Súčet na začiatku aktuálnej hodiny; None kým nepoznáme počítadlo zariadenia
+        self.sum_kwh = state.get("sum")
+        # Posun po vynulovaní počítadla zariadenia, aby súčet pokračoval
+        self.offset_kwh = state.get("offset", 0.0)
+        self._device_total = state.get("device_total")
+        self._device_total_at = None
+        self._hour = dt_util.parse_datetime(state["hour"]) if state.get("hour") else None
+        self._hour_kwh = state.get("hour_kwh", 0.0)
+        # Posledná vzorka pred reštartom - interval k prvej novej vzorke sa ešte zaintegruje
+        sample_at = dt_util.parse_datetime(state["sample_at"]) if state.get("sample_at") else None
+        self._last_sample = (sample_at, state["sample_power"]) if sample_at is not None else None
+        self._pending = []
+        self._metadata = None
+        self.last_drift_kwh = None
+        self._listeners = []
+
+    @property
+    def total_kwh(self):
+        if self.sum_kwh is None:
+            return None
+        return self.sum_kwh + self._hour_kwh
+
+    @property
+    def current_hour(self):
+        """Start of the hour being integrated; earlier hours are final."""
+        return self._hour
+
+    @property
+    def pending_hours(self) -> int:
+        return len(self._pending)
+
+    def reference_kwh(self, device_total):
+        """Statistics sum that corresponds to a device counter reading."""
+        return device_total + self.offset_kwh
+
+    @callback
+    def async_start(self):
+        # Bez kontextu - vzorka sa berie pri každom update, aj keď sa výkon nezmenil
+        return self._coordinator.async_add_listener(self._async_sample)
+
+    @callback
+    def async_add_listener(self, listener):
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    @callback
+    def async_set_statistic(self, statistic_id: str, name: str) -> None:
+        """Bind the integrator to the external statistic it writes (see energy_statistic_id)."""
+        self._metadata = energy_metadata(statistic_id, name)
+        self._async_import_pending()
+
+    @property
+    def metadata(self):
+        """Statistics metadata, None until the energy entity is added."""
+        return self._metadata
+
+    @callback
+    def _async_sample(self) -> None:
+        coordinator = self._coordinator
+        if coordinator.restored:
+            # Živé údaje ešte neprišli; uložená vzorka zostáva
+            return
+        if not coordinator.last_update_success:
+            self._last_sample = None
+            return
+
+        now = dt_util.utcnow()
+        self._track_device_total(now)
+        power = coordinator.data.get("active_power")
+        if self.sum_kwh is None or "active_power" in coordinator.stale_keys or not isinstance(power, (int, float)):
+            self._last_sample = None
+            return
+
+        if self._hour is None:
+            self._hour = hour_start(now)
+        energy = self._integrate(*self._last_sample, now, float(power)) if self._last_sample is not None else {}
+        self._last_sample = (now, float(power))
+
+        pending = len(self._pending)
+        self._book(now, energy)
+        if len(self._pending) > pending:
+            self._async_import_pending()
+
+    def _track_device_total(self, now) -> None:
+        total = self._coordinator.data.get("energy_total_kwh")
+        if "energy_total_kwh" in self._coordinator.stale_keys or not isinstance(total, (int, float)):
+            return
+        if self._device_total is not None and total < self._device_total - RECONCILE_TOLERANCE_KWH:
+            _LOGGER.info("Wattrix energy counter went back from %s to %s kWh, keeping the sum continuous",
+                         self._device_total, total)
+            self.offset_kwh += self._device_total
+        self._device_total = total
+        self._device_total_at = now
+        if self.sum_kwh is None:
+            # Kotva - súčet štatistiky začína na počítadle zariadenia
+            self.sum_kwh = self.reference_kwh(total)
+            self._hour = hour_start(now)
+            self._hour_kwh = 0.0
+
+    @staticmethod
+    def _integrate(t0, p0, t1, p1) -> dict:
+        """Energy of one sample interval per hour start."""
+        energy = {}
+        if t1 <= t0 or t1 - t0 > MAX_SAMPLE_GAP:
+            return energy
+        # Interval cez hranicu hodiny sa rozdelí, výkon na hranici sa interpoluje
+        while True:
+            hour = hour_start(t0)
+            boundary = hour + HOUR
+            if t1 <= boundary:
+                energy[hour] = energy.get(hour, 0.0) + _trapezoid_kwh(t0, p0, t1, p1)
+                return energy
+            p_boundary = p0 + (p1 - p0) * ((boundary - t0) / (t1 - t0))
+            energy[hour] = energy.get(hour, 0.0) + _trapezoid_kwh(t0, p0, boundary, p_boundary)
+            t0, p0 = boundary, p_boundary
+
+    def _book(self, now, energy) -> None:
+        """Add integrated energy to its hours and close every hour before the hour of now.
+
+        This is the only place hours are closed. The hour that ended last is
+        reconciled with the device counter, leaving out the energy already
+        integrated into later hours.
+        """
+        current = hour_start(now)
+        self._hour_kwh += energy.get(self._hour, 0.0)
+        while self._hour < current:
+            later_kwh = sum(kwh for hour, kwh in energy.items() if hour > self._hour)
+            self._close_hour(now, self._hour + HOUR == current, later_kwh)
+            self._hour_kwh = energy.get(self._hour, 0.0)
+        # Rozpracovaná hodina prežije reštart; zápis store odkladá a zlučuje
+        self.async_save()
+
+    def _close_hour(self, now, reconcile: bool, later_kwh: float = 0.0) -> None:
+        energy = self._hour_kwh
+        if reconcile and self._device_total_at is not None and now - self._device_total_at <= MAX_SAMPLE_GAP:
+            drift = self.reference_kwh(self._device_total) - later_kwh - (self.sum_kwh + energy)
+            self.last_drift_kwh = round(drift, 4)
+            if abs(drift) > RECONCILE_TOLERANCE_KWH:
+                # Korekciu pripíšeme uzatváranej hodine; súčet nesmie klesať
+                _LOGGER.debug("Wattrix energy drift %.3f kWh corrected in hour %s", drift, self._hour)
+                energy = max(energy + drift, 0.0)
+
+        self.sum_kwh += energy
+        self._pending.append((self._hour, self.sum_kwh))
+        self._hour += HOUR
+        self._hour_kwh = 0.0
+
+    @callback
+    def _async_import_pending(self) -> None:
+        if self._pending and self._metadata is not None:
+            rows, self._pending = self._pending, []
+            async_import_energy(self._hass, self._metadata, rows)
+        self.async_save()
+        for listener in list(self._listeners):
+            listener()
+
+    @callback
+    def async_save(self) -> None:
+        if self._store is None:
+            return
+        self._store.async_set_energy({
+            "sum": self.sum_kwh,
+            "offset": self.offset_kwh,
+            "device_total": self._device_total,
+            "hour": self._hour.isoformat() if self._hour else None,
+            "hour_kwh": self._hour_kwh,
+            "sample_at": self._last_sample[0].isoformat() if self._last_sample else None,
+            "sample_power": self._last_sample[1] if self._last_sample else None,
+        })
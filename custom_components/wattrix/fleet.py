@@ -0,0 +1,115 @@
+import asyncio
+import logging
+from datetime import timedelta
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import callback
+
+from .connection import create_session
+from .const import DATA_FLEET
+
+_LOGGER = logging.getLogger(__name__)
+
+# Max. počet súbežných requestov na všetky Wattrix zariadenia spolu
+FLEET_MAX_CONCURRENT_REQUESTS = 8
+# Okno, do ktorého sa rozložia fázy pollovania jednotlivých zariadení
+FLEET_STAGGER_WINDOW = timedelta(seconds=15)
+_GOLDEN_RATIO_FRACTION = 0.6180339887
+
+# Kľúče, ktoré fleet sčítava cez všetky zariadenia
+FLEET_TOTAL_KEYS = ("active_power", "energy_total_kwh", "energy_today_kwh")
+
+
+@callback
+def async_get_fleet(hass) -> "WattrixFleet":
+    fleet = hass.data.get(DATA_FLEET)
+    if fleet is None:
+        fleet = hass.data[DATA_FLEET] = WattrixFleet(hass)
+    return fleet
+
+
+class WattrixFleet:
+    """State shared by every Wattrix device of one Home Assistant instance."""
+
+    def __init__(self, hass):
+        self._hass = hass
+        self.request_semaphore = asyncio.Semaphore(FLEET_MAX_CONCURRENT_REQUESTS)
+        self._session = None
+        self._members = {}
+        self._next_index = 0
+        self._values = {}
+        self.totals = {key: 0.0 for key in FLEET_TOTAL_KEYS}
+        self._listeners = []
+        # Zariadenia, ktorých senzorová platforma vie vytvoriť fleet senzory
+        self._sensor_offers = {}
+        self.sensors_owner = None
+
+    @property
+    def session(self):
+        """One connection pool shared by all Wattrix HTTP traffic, config flow included."""
+        if self._session is None or self._session.closed:
+            self._session = create_session()
+            self._hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, self._async_close_session)
+        return self._session
+
+    async def _async_close_session(self, _event=None) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    @callback
+    def async_register(self, entry_id) -> timedelta:
+        """Add a device and return its polling phase offset."""
+        index = self._members.setdefault(entry_id, self._next_index)
+        if index == self._next_index:
+            self._next_index += 1
+        # Zlatý rez rozloží fázy rovnomerne bez ohľadu na počet zariadení
+        return FLEET_STAGGER_WINDOW * ((index * _GOLDEN_RATIO_FRACTION) % 1)
+
+    async def async_unregister(self, entry_id) -> None:
+        self._members.pop(entry_id, None)
+        self._sensor_offers.pop(entry_id, None)
+        for key in FLEET_TOTAL_KEYS:
+            self.async_update_value(entry_id, key, None)
+        if self.sensors_owner == entry_id:
+            self.sensors_owner = None
+            # Fleet senzory prevezme ďalšie zariadenie, ktoré ešte beží
+            if self._sensor_offers:
+                self._async_assign_sensors(next(iter(self._sensor_offers)))
+        if not self._members:
+            await self._async_close_session()
+
+    @callback
+    def async_offer_sensors(self, entry_id, add_sensors):
+        """Register a device's callback that adds the fleet sensors to its sensor platform.
+
+        The first device owns the fleet sensors; when it leaves, the next
+        registered device adds them again under the same unique IDs.
+        """
+        self._sensor_offers[entry_id] = add_sensors
+        if self.sensors_owner is None:
+            self._async_assign_sensors(entry_id)
+        return lambda: self._sensor_offers.pop(entry_id, None)
+
+    @callback
+    def _async_assign_sensors(self, entry_id) -> None:
+        self.sensors_owner = entry_id
+        self._sensor_offers[entry_id]()
+
+    @callback
+    def async_update_value(self, entry_id, key, value) -> None:
+        """Fold one device's new value into the fleet total."""
+        new = value if isinstance(value, (int, float)) else 0.0
+        old = self._values.pop((entry_id, key), 0.0)
+        if value is not None:
+            self._values[(entry_id, key)] = new
+        if new == old:
+            return
+        self.totals[key] += new - old
+        for listener in list(self._listeners):
+            listener(key)
+
+    @callback
+    def async_add_listener(self, listener):
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
@@ -1,19 +1,42 @@
+import asyncio
+import hashlib
+import json
 import logging
 from datetime import timedelta
-import datetime
+from urllib.parse import urlparse
 
-import aiohttp
 import async_timeout
-from homeassistant.components.number import NumberEntity
+from homeassistant.components.number import NumberEntity, NumberMode
 from homeassistant.components.select import SelectEntity, SelectEntityDescription
 from homeassistant.components.sensor import SensorEntity
+from homeassistant.const import EVENT_CORE_CONFIG_UPDATE
 from homeassistant.core import callback, HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import translation
-from homeassistant.helpers.entity import Entity
-from homeassistant.helpers.translation import async_get_translations
+from homeassistant.helpers.entity import EntityCategory
+from homeassistant.helpers.event import async_track_point_in_time
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.helpers.update_coordinator import UpdateFailed, CoordinatorEntity
-
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_BATCH_SENSORS,
+    CONF_DEVICE_INFO_INTERVAL,
+    CONF_SCHEDULE_INTERVAL,
+    CONF_SENSORS_INTERVAL,
+    CONF_STATUS_INTERVAL,
+    DEFAULT_DEVICE_INFO_INTERVAL,
+    DEFAULT_IDENTITY_INTERVAL,
+    DEFAULT_SCHEDULE_INTERVAL,
+    DEFAULT_SENSORS_INTERVAL,
+    DEFAULT_STATUS_INTERVAL,
+)
+from .energy import energy_statistic_id
+from .fleet import FLEET_TOTAL_KEYS
+from .poll_scheduler import MIN_WAKEUP, WattrixPollScheduler
+from .schedule import WattrixScheduleIndex, slot_ended
+from .state import WattrixSnapshot, WattrixStagedSettings
+from .websocket_client import WattrixWebSocketClient
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -35,13 +58,47 @@ WATTRIX_MODE_SELECT_DESCRIPTION = SelectEntityDescription(
 )
 
 
+# Preložené možnosti zdieľané všetkými zariadeniami a reloadmi, kľúč (domain, jazyk)
+_TRANSLATED_OPTIONS_CACHE = {}
+_TRANSLATED_OPTIONS_LOADING = {}
+
+
 async def get_translated_options(hass: HomeAssistant, domain: str = "wattrix") -> dict:
-    """Get translated options for mode selector."""
+    """Get translated options for mode selector, looked up once per language."""
+    cache_key = (domain, hass.config.language)
+    cached = _TRANSLATED_OPTIONS_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Súbežné entity čakajú na jedno spoločné načítanie
+    loading = _TRANSLATED_OPTIONS_LOADING.get(cache_key)
+    if loading is None:
+        loading = _TRANSLATED_OPTIONS_LOADING[cache_key] = hass.async_create_task(
+            _async_load_translated_options(hass, domain, hass.config.language)
+        )
+    try:
+        mode_translations = await asyncio.shield(loading)
+    finally:
+        if loading.done():
+            _TRANSLATED_OPTIONS_LOADING.pop(cache_key, None)
+
+    _TRANSLATED_OPTIONS_CACHE[cache_key] = mode_translations
+    return mode_translations
+
 
+@callback
+def async_invalidate_translated_options(language: str = None) -> None:
+    """Drop cached option maps of every language except the given one."""
+    for cache_key in list(_TRANSLATED_OPTIONS_CACHE):
+        if cache_key[1] != language:
+            del _TRANSLATED_OPTIONS_CACHE[cache_key]
+
+
+async def _async_load_translated_options(hass: HomeAssistant, domain: str, language: str) -> dict:
     # Získaj preklady pre aktuálny jazyk
     translations = await translation.async_get_translations(
         hass=hass,
-        language=hass.config.language,
+        language=language,
         category="entity",
         integrations=[domain]
     )
@@ -57,59 +114,572 @@ async def get_translated_options(hass: HomeAssistant, domain: str = "wattrix") -
     return mode_translations
 
 
-async def get_device_serial(host: str) -> str:
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{host}/serial-number") as response:
-                response.raise_for_status()
-                data = await response.json()
-                return data.get("serial_number", None)
-    except Exception as e:
-        _LOGGER.warning(f"Failed to fetch serial number: {e}")
-        return None
+REST_SENSOR_IDS = ("energy_total_kwh", "energy_today_kwh", "heating_state", "active_power")
+
+# endpoint: (option, default interval v sekundách); deadline requestov drží WattrixHost
+POLL_ENDPOINTS = {
+    "status": (CONF_STATUS_INTERVAL, DEFAULT_STATUS_INTERVAL),
+    "sensors": (CONF_SENSORS_INTERVAL, DEFAULT_SENSORS_INTERVAL),
+    "device_info": (CONF_DEVICE_INFO_INTERVAL, DEFAULT_DEVICE_INFO_INTERVAL),
+    "schedule": (CONF_SCHEDULE_INTERVAL, DEFAULT_SCHEDULE_INTERVAL),
+    "serial_number": (None, DEFAULT_IDENTITY_INTERVAL),
+    "version": (None, DEFAULT_IDENTITY_INTERVAL),
+}
+
+SCHEDULE_HOURS = 24 * 7
+
+# Adaptívny interval /status a senzorov podľa režimu zariadenia
+ADAPTIVE_ENDPOINTS = ("status", "sensors")
+REGULATING_MODES = ("EXPORT_SURPLUS_HEATING", "SOLAR_AND_GRID_HEATING")
+IDLE_MODES = ("DISABLED_HEATING", "TOTAL_STOP")
+REGULATING_INTERVAL = timedelta(seconds=5)
+IDLE_INTERVAL = timedelta(seconds=60)
+BOOST_INTERVAL = timedelta(seconds=2)
+BOOST_DURATION = timedelta(seconds=60)
+
+# Starší snapshot sa pri štarte neobnovuje
+RESTORE_MAX_AGE = timedelta(hours=24)
+
+# Nemenné údaje - po úspešnom načítaní sa už nepollujú, kým ich niečo nezneplatní
+IDENTITY_ENDPOINTS = ("serial_number", "version")
+
+
+MODE_SELECT_KEYS = frozenset({"mode", "power_limit_percentage", "timeout_seconds", "setpoint"})
+# Pseudo-kľúč, ktorý sa mení so stavom circuit breakera hosta
+BREAKER_KEY = "circuit_breaker"
+# Kontext listenerov, ktoré závisia od pripojenia websocketu
+PUSH_KEY = "push_connected"
+# Pseudo-kľúč, ktorý sa mení s last_update_success
+ONLINE_KEY = "online"
+
+
+def _context_changed(context, changed_keys) -> bool:
+    if isinstance(context, frozenset):
+        return not context.isdisjoint(changed_keys)
+    return context in changed_keys
 
 
 class WattrixDataUpdateCoordinator(DataUpdateCoordinator):
-    def __init__(self, hass, host):
+    """Single coordinator per device; polls each endpoint on its own cadence."""
+
+    def __init__(self, hass, host, entry=None, store=None, fleet=None):
         self._host = host
+        self._entry = entry
+        self._store = store
+        self._fleet = fleet
+        self._push_was_connected = False
+        self._last_uptime = None
+        self._boost_until = None
+        self._was_offline = False
+        self._push_waiters = []
+        self.last_data_received = None
+        # Údaje pochádzajú z uloženého snapshotu, živé ešte neprišli
+        self.restored = False
+        self._schedule_etag = None
+        self.schedule_revision = None
+        self.schedule_hash = None
+        self._schedule_index = WattrixScheduleIndex()
+        self._ws_client = None
+        self._push_task = None
+        self._batch_supported = True
+        self.push_connected = False
+        # Kľúče, ktoré sa pri poslednom pokuse nepodarilo načítať
+        self.stale_keys = set()
+        self._endpoint_keys = {}
+        # Stav, ktorý naposledy videli listenery - z neho sa počíta, čo sa zmenilo
+        self._published_data = WattrixSnapshot()
+        self._published_stale = set()
+        self._published_success = None
+        self._published_breaker = None
+        self._published_restored = False
+        self._published_push = False
+        self._published_online = None
+        if store is not None:
+            store.async_set_snapshot_provider(self._snapshot)
+
+        now = dt_util.utcnow()
+        self._options = dict(entry.options) if entry else {}
+        phase = fleet.async_register(entry.entry_id) if fleet is not None and entry is not None else timedelta(0)
+        self._scheduler = WattrixPollScheduler(phase)
+        for endpoint in POLL_ENDPOINTS:
+            self._scheduler.add(endpoint, self._base_interval(endpoint), now)
+
+        self._fetchers = {
+            "status": self._host.async_get_status,
+            "sensors": self._async_fetch_sensors_endpoint,
+            "device_info": self._host.async_get_device_info,
+            "schedule": self._async_fetch_schedule,
+            "serial_number": self._host.async_get_serial_number,
+            "version": self._host.async_get_version,
+        }
+
         super().__init__(
             hass,
             _LOGGER,
             name="Wattrix data coordinator",
-            update_interval=timedelta(seconds=15),
+            update_interval=self._scheduler.next_wakeup(now),
         )
 
-        self.data = {
+        self.data = WattrixSnapshot({
             "mode": "DISABLED_HEATING",
             "power_limit_percentage": 100,
             "timeout_seconds": 900,
-            "power_limit_percentage_to_set": 100,
-            "timeout_seconds_to_set": 900,
             "setpoint": 200,
-            "setpoint_to_set": 200,
-        }
+            "heating_state": None,
+            "active_power": None,
+            "schedule": [],
+        })
+        # Hodnoty pripravené používateľom - poll ich nikdy neprepíše
+        self.staged = WattrixStagedSettings(store)
 
     async def _async_update_data(self):
-        """Fetch data from Wattrix."""
+        """Fetch every endpoint that is due, concurrently."""
+        if self._host.breaker.is_open:
+            # Breaker je otvorený - bežné requesty by aj tak zlyhali hneď, skúsime jeden lacný probe
+            self._was_offline = True
+            if not await self._async_probe():
+                self._async_adapt_intervals(dt_util.utcnow())
+                raise UpdateFailed("Wattrix is offline")
+
+        now = dt_util.utcnow()
+        due = self._scheduler.due(now)
+        if not due:
+            if self.last_update_success:
+                return self.data
+            raise UpdateFailed("Wattrix is still unavailable")
+
+        results = await asyncio.gather(*(self._async_poll_endpoint(endpoint) for endpoint in due))
+        for endpoint in due:
+            self._scheduler.mark_polled(endpoint.name, now)
+
+        if any(results):
+            if self._was_offline:
+                # Zariadenie je znova dostupné - mohlo medzitým dostať nový firmware
+                self._invalidate_identity("reconnect")
+            self._was_offline = False
+        else:
+            self._was_offline = True
+        self._async_adapt_intervals(dt_util.utcnow())
+
+        if not any(results):
+            raise UpdateFailed("No data received from Wattrix")
+
+        _LOGGER.debug("Fetched data: %s", self.data)
+        return self.data
+
+    async def _async_probe(self) -> bool:
+        if self._host.breaker.seconds_until_probe() > 0:
+            return False
+        return await self._host.async_probe()
+
+    async def _async_poll_endpoint(self, endpoint) -> bool:
         try:
-            async with async_timeout.timeout(10):
-                data = await self._host.async_get_status()
+            payload = await self._fetchers[endpoint.name]()
+        except Exception as err:
+            _LOGGER.warning("Wattrix %s request failed: %s", endpoint.name, err)
+            payload = None
 
-                if not data:
-                    raise UpdateFailed("No data received from Wattrix")
+        if endpoint.name == "sensors":
+            # Senzory si stale kľúče riešia po jednom
+            return payload
 
-                if self.data is None:
-                    raise  UpdateFailed("Data is not initialized")
-                else:
-                    self.data.update(data)
+        if payload is None or payload == {}:
+            self.stale_keys.update(self._endpoint_keys.get(endpoint.name, ()))
+            return False
 
-                _LOGGER.info(f"Fetched data: {self.data}")
+        self._apply_endpoint(endpoint.name, payload)
+        self._mark_live()
+        return True
 
-                return self.data
+    def _apply_endpoint(self, name, payload):
+        if name == "schedule":
+            if payload is not self.data["schedule"]:
+                self.data = self.data.replace({"schedule": payload})
+                self.schedule_hash = hashlib.sha1(
+                    json.dumps(payload, sort_keys=True).encode()
+                ).hexdigest()[:12]
+            self.stale_keys.discard("schedule")
+            return
+
+        if name == "status":
+            self._check_identity(payload)
+        elif name in IDENTITY_ENDPOINTS:
+            self._scheduler.pause(name)
+            if self._store is not None:
+                self._store.async_set_identity(name, payload)
+
+        self.data = self.data.replace(payload)
+        self._endpoint_keys[name] = payload.keys()
+        self.stale_keys.difference_update(payload.keys())
+
+    @property
+    def schedule_index(self) -> WattrixScheduleIndex:
+        """Index of the current schedule, rebuilt only when the schedule list is replaced."""
+        schedule = self.data.get("schedule")
+        if self._schedule_index.schedule is not schedule:
+            self._schedule_index = WattrixScheduleIndex(schedule)
+        return self._schedule_index
+
+    async def _async_fetch_schedule(self):
+        data = await self._host.async_get_schedule(
+            hours=SCHEDULE_HOURS, etag=self._schedule_etag, since_revision=self.schedule_revision
+        )
+        if data is None:
+            # 304 Not Modified - nič neparsujeme
+            return self.data["schedule"]
+
+        if "changed" in data or "removed" in data:
+            schedule = self._merge_schedule_changes(data)
+        elif "schedule" in data:
+            schedule = data["schedule"]   # rovno vráti list slotov
+        else:
+            raise UpdateFailed("No schedule data received from Wattrix")
+
+        self._schedule_etag = data.get("etag")
+        self.schedule_revision = data.get("revision")
+        return schedule
+
+    def _merge_schedule_changes(self, data):
+        """Apply an incremental schedule answer to the known slots, keyed by slot start."""
+        now = dt_util.utcnow()
+        removed = set(data.get("removed", ()))
+        slots = {
+            slot.get("start"): slot for slot in self.data["schedule"]
+            if slot.get("start") not in removed and not slot_ended(slot, now)
+        }
+        for slot in data.get("changed", ()):
+            slots[slot.get("start")] = slot
+        return sorted(slots.values(), key=lambda slot: slot.get("start") or "")
 
+    async def _async_fetch_sensors_endpoint(self) -> bool:
+        if self._batch_enabled():
+            sensors = await self._async_fetch_sensors_batch()
+        else:
+            sensors = await self._async_fetch_sensors()
+
+        changes = {}
+        for sensor_id, payload in sensors.items():
+            if payload:
+                changes[sensor_id] = self._sensor_value(sensor_id, payload)
+                self.stale_keys.discard(sensor_id)
+            else:
+                self.stale_keys.add(sensor_id)
+        if changes:
+            # Všetky senzory jedného pollu jednou výmenou snapshotu
+            self.data = self.data.replace(changes)
+            self._mark_live()
+        return bool(changes)
+
+    def _check_identity(self, status):
+        """Invalidate cached identity when a status shows a reboot or a new firmware version."""
+        uptime = status.get("uptime")
+        if isinstance(uptime, (int, float)):
+            if self._last_uptime is not None and uptime < self._last_uptime:
+                self._invalidate_identity("reboot")
+            self._last_uptime = uptime
+
+        version = status.get("version")
+        if version is not None and self.data.get("version") not in (None, version):
+            self._invalidate_identity("version change")
+
+    @callback
+    def _invalidate_identity(self, reason):
+        _LOGGER.debug("Refreshing Wattrix identity after %s", reason)
+        now = dt_util.utcnow()
+        for name in IDENTITY_ENDPOINTS:
+            self._scheduler.resume(name, now)
+
+    def _batch_enabled(self) -> bool:
+        if not self._batch_supported or self._entry is None:
+            return False
+        return self._entry.options.get(CONF_BATCH_SENSORS, False)
+
+    async def _async_fetch_sensors(self) -> dict:
+        results = await asyncio.gather(*(
+            self._async_or_none(self._host.async_get_sensor(sensor_id), sensor_id)
+            for sensor_id in REST_SENSOR_IDS
+        ))
+        return dict(zip(REST_SENSOR_IDS, results))
+
+    async def _async_fetch_sensors_batch(self) -> dict:
+        try:
+            sensors = await self._host.async_get_sensors(REST_SENSOR_IDS)
+        except Exception as err:
+            _LOGGER.warning("Batched sensor request failed, fetching one by one: %s", err)
+            return await self._async_fetch_sensors()
+
+        if sensors is None:
+            _LOGGER.info("Wattrix firmware does not support batched sensor requests")
+            self._batch_supported = False
+            return await self._async_fetch_sensors()
+        return {sensor_id: sensors.get(sensor_id) for sensor_id in REST_SENSOR_IDS}
+
+    async def _async_or_none(self, coro, what):
+        try:
+            return await coro
         except Exception as err:
-            _LOGGER.warning("Wattrix communication failed: %s", err)
-            raise UpdateFailed(f"Error fetching data: {err}") from err
+            _LOGGER.warning("Wattrix %s request failed: %s", what, err)
+            return None
+
+    @staticmethod
+    def _sensor_value(sensor_id, payload):
+        if sensor_id == "heating_state":
+            raw_val = str(payload.get('value', 'FALSE')).strip().upper()
+            return raw_val == "TRUE"
+        return payload.get("value")
+
+    @property
+    def host(self):
+        return self._host
+
+    @property
+    def available(self) -> bool:
+        """Entities show data while the device answers or a restored snapshot is waiting for live data."""
+        return self.last_update_success or self.restored
+
+    def _mark_live(self) -> None:
+        self.last_data_received = dt_util.utcnow()
+        self.restored = False
+
+    @callback
+    def async_restore_snapshot(self, snapshot) -> bool:
+        """Seed the data from the persisted snapshot; every restored key stays stale until polled."""
+        saved_at = dt_util.parse_datetime(snapshot.get("saved_at") or "") if snapshot else None
+        if saved_at is None or dt_util.utcnow() - saved_at > RESTORE_MAX_AGE:
+            return False
+        data = snapshot.get("data") or {}
+        self.data = self.data.replace(data)
+        self.stale_keys.update(data)
+        self.last_data_received = saved_at
+        self.restored = True
+        _LOGGER.debug("Restored Wattrix snapshot from %s", saved_at)
+        return True
+
+    @callback
+    def _snapshot(self):
+        if self.restored:
+            # Kým neprišli živé dáta, nechaj pôvodný snapshot
+            return self._store.snapshot
+        return {
+            "saved_at": (self.last_data_received or dt_util.utcnow()).isoformat(),
+            "data": self.data.as_dict(),
+        }
+
+    @property
+    def data_age(self):
+        """Seconds since any data last arrived from the device."""
+        if self.last_data_received is None:
+            return None
+        return (dt_util.utcnow() - self.last_data_received).total_seconds()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify only listeners whose keys changed since the last notification.
+
+        A listener's context is the data key it renders (or a frozenset of keys);
+        listeners without a context are always notified, and everyone is notified
+        when availability changes.
+        """
+        changed_keys = self._async_collect_changed_keys()
+        if self._fleet is not None and self._entry is not None:
+            for key in changed_keys.intersection(FLEET_TOTAL_KEYS):
+                self._fleet.async_update_value(self._entry.entry_id, key, self.data.get(key))
+        availability_changed = self.available != self._published_success
+        self._published_success = self.available
+        if changed_keys and self._store is not None and not self.restored:
+            self._store.async_schedule_snapshot_save()
+
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or availability_changed or _context_changed(context, changed_keys):
+                update_callback()
+
+    def _async_collect_changed_keys(self) -> set:
+        # Snapshoty sú nemenné - netreba kopírovať, nezmenený snapshot sa porovná identitou
+        changed_keys = self.data.changed_keys(self._published_data)
+        # Zmena príznaku stale mení atribúty entity
+        changed_keys.update(self.stale_keys ^ self._published_stale)
+        if self.restored != self._published_restored:
+            # Príznak restored je v atribútoch každej stale entity
+            changed_keys.update(self.stale_keys)
+            self._published_restored = self.restored
+        breaker = self._host.breaker.state, self._host.breaker.consecutive_failures
+        if breaker != self._published_breaker:
+            changed_keys.add(BREAKER_KEY)
+            self._published_breaker = breaker
+        if self.push_connected != self._published_push:
+            changed_keys.add(PUSH_KEY)
+            self._published_push = self.push_connected
+        # Pri obnovenom snapshote sa dostupnosť nemení, ale výsledok posledného pollu áno
+        if self.last_update_success != self._published_online:
+            changed_keys.add(ONLINE_KEY)
+            self._published_online = self.last_update_success
+
+        self._published_data = self.data
+        self._published_stale = set(self.stale_keys)
+        return changed_keys
+
+    async def async_request_refresh(self) -> None:
+        """Request a refresh; an explicit request always includes a fresh /status."""
+        if not self.push_connected:
+            self._scheduler.mark_due("status", dt_util.utcnow())
+        await super().async_request_refresh()
+
+    @callback
+    def async_set_poll_intervals(self, options) -> None:
+        """Apply intervals changed in the options flow without a reload."""
+        now = dt_util.utcnow()
+        self._options = dict(options)
+        for endpoint, (option, _default) in POLL_ENDPOINTS.items():
+            if option and endpoint not in ADAPTIVE_ENDPOINTS:
+                self._scheduler.set_interval(endpoint, self._base_interval(endpoint), now)
+        self._async_adapt_intervals(now)
+        self._schedule_refresh()
+
+    @callback
+    def async_boost_polling(self) -> None:
+        """Poll status and sensors fast for a while, e.g. right after a mode change."""
+        now = dt_util.utcnow()
+        self._boost_until = now + BOOST_DURATION
+        self._async_adapt_intervals(now)
+
+    def _base_interval(self, endpoint) -> timedelta:
+        option, default = POLL_ENDPOINTS[endpoint]
+        return timedelta(seconds=self._options.get(option, default) if option else default)
+
+    def _adaptive_interval(self, endpoint, now) -> timedelta:
+        base = self._base_interval(endpoint)
+        if self._boost_until is not None and now < self._boost_until:
+            return min(base, BOOST_INTERVAL)
+        mode = self.data.get("mode") if self.data else None
+        if mode in REGULATING_MODES:
+            return min(base, REGULATING_INTERVAL)
+        if mode in IDLE_MODES:
+            return max(base, IDLE_INTERVAL)
+        return base
+
+    @callback
+    def _async_adapt_intervals(self, now) -> None:
+        """Retune the adaptive endpoints to the device mode and pick the next wakeup."""
+        for endpoint in ADAPTIVE_ENDPOINTS:
+            self._scheduler.set_interval(endpoint, self._adaptive_interval(endpoint, now), now)
+
+        if self._host.breaker.is_open:
+            # Zobuď sa až na ďalší probe - backoff s jitterom riadi breaker
+            self.update_interval = max(timedelta(seconds=self._host.breaker.seconds_until_probe()), MIN_WAKEUP)
+        else:
+            self.update_interval = self._scheduler.next_wakeup(now)
+
+    @callback
+    def async_apply_bootstrap(self, bootstrap: dict) -> None:
+        """Seed the data from the setup bootstrap so those endpoints are not polled again right away."""
+        now = dt_util.utcnow()
+        for name in ("serial_number", "version", "device_info", "status"):
+            if bootstrap.get(name) is not None:
+                self._apply_endpoint(name, bootstrap[name])
+                self._scheduler.mark_polled(name, now)
+        if bootstrap.get("status") is not None:
+            self._mark_live()
+        # Identitu z cache over na pozadí, nové pripojenie ju mohlo zmeniť
+        for name in bootstrap.get("identity_cached", ()):
+            self._scheduler.resume(name, now)
+        self._async_adapt_intervals(now)
+        self.async_update_listeners()
+
+    @callback
+    def async_apply_status(self, status: dict) -> None:
+        """Merge a status payload fetched or pushed outside the polling cycle."""
+        # Nepoužívame async_set_updated_data - to by posúvalo časovač ostatných endpointov
+        mode = self.data.get("mode")
+        self._apply_endpoint("status", status)
+        self._mark_live()
+        self.last_update_success = True
+        if self.data.get("mode") != mode:
+            self._async_adapt_intervals(self.last_data_received)
+            self._schedule_refresh()
+        self.async_update_listeners()
+
+    @callback
+    def async_start_push(self) -> None:
+        """Listen for status events on the device websocket, poll /status only while it is down."""
+        ws_host = urlparse(self._host._base_url).hostname or self._host._base_url
+        self._ws_client = WattrixWebSocketClient(
+            self.hass, ws_host, self._async_handle_push_event, self._async_push_connected,
+            self._async_push_disconnected,
+        )
+        self._push_task = self.hass.async_create_background_task(
+            self._ws_client.async_run(), name=f"{self.name} websocket"
+        )
+
+    @property
+    def push_stats(self):
+        """Ingestion counters of the websocket, None before push was started."""
+        return self._ws_client.as_dict() if self._ws_client is not None else None
+
+    @callback
+    def async_stop_push(self) -> None:
+        if self._push_task:
+            self._push_task.cancel()
+            self._push_task = None
+        self.push_connected = False
+
+    @callback
+    def _async_push_disconnected(self) -> None:
+        if not self.push_connected:
+            return
+        self.push_connected = False
+        if self._host.recorder is not None:
+            self._host.recorder.record_connection(False)
+        # Socket je dole - znova zapni polling /status
+        self._scheduler.resume("status", dt_util.utcnow())
+        self.async_update_listeners()
+        self.hass.async_create_task(self.async_request_refresh())
+
+    @callback
+    def _async_push_connected(self) -> None:
+        _LOGGER.info("Wattrix websocket connected, /status polling paused")
+        if self._push_was_connected:
+            self._invalidate_identity("websocket reconnect")
+        self._push_was_connected = True
+        self.push_connected = True
+        if self._host.recorder is not None:
+            self._host.recorder.record_connection(True)
+        self._scheduler.pause("status")
+        self.async_update_listeners()
+
+    async def _async_handle_push_event(self, event):
+        """Apply one pushed event to the coordinator data."""
+        if self._host.recorder is not None:
+            self._host.recorder.record_ws(event)
+        if not isinstance(event, dict):
+            return
+        data = event.get("data", event)
+        if not isinstance(data, dict) or not data:
+            return
+
+        self.async_apply_status(data)
+        for predicate, waiter in self._push_waiters:
+            if not waiter.done() and predicate(self.data):
+                waiter.set_result(True)
+
+    async def async_push_send(self, payload) -> bool:
+        """Send a message to the device over the websocket; False while it is down."""
+        if not self.push_connected or self._ws_client is None:
+            return False
+        return await self._ws_client.async_send(payload)
+
+    async def async_wait_for_push(self, predicate, timeout) -> bool:
+        """Wait until a pushed event leaves the data matching predicate."""
+        waiter = self.hass.loop.create_future()
+        item = (predicate, waiter)
+        self._push_waiters.append(item)
+        try:
+            async with async_timeout.timeout(timeout):
+                await waiter
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._push_waiters.remove(item)
 
 
 class WattrixSensor(SensorEntity):
@@ -143,13 +713,19 @@ class WattrixSensor(SensorEntity):
     def native_unit_of_measurement(self):
         return self._unit
 
+    @property
+    def extra_state_attributes(self):
+        if self._key in self.coordinator.stale_keys:
+            return {"stale": True, "restored": self.coordinator.restored}
+        return None
+
     @property
     def available(self):
-        return self.coordinator.last_update_success
+        return self.coordinator.available
 
     async def async_added_to_hass(self):
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.async_add_listener(self.async_write_ha_state, self._key)
         )
 
     @property
@@ -182,9 +758,14 @@ class WattrixOnlineSensor(SensorEntity):
     def available(self):
         return True
 
+    @property
+    def extra_state_attributes(self):
+        return self.coordinator.host.breaker.as_dict()
+
     async def async_added_to_hass(self):
+        # Stav je last_update_success, atribúty circuit breaker
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.async_add_listener(self.async_write_ha_state, frozenset({ONLINE_KEY, BREAKER_KEY}))
         )
 
     @property
@@ -195,6 +776,7 @@ class WattrixModeSelect(CoordinatorEntity, SelectEntity):
     def __init__(self, coordinator,
                  description: SelectEntityDescription,
                  host,
+                 commands,
                  serial_number,
                  initial_state,
                  get_percentage,
@@ -204,10 +786,11 @@ class WattrixModeSelect(CoordinatorEntity, SelectEntity):
                  get_minimal_temperature,
                  get_minimal_temperature_recovery_delta,
                  ):
-        super().__init__(coordinator)
+        super().__init__(coordinator, MODE_SELECT_KEYS)
         self._hass = coordinator.hass
         self.entity_description = description
         self._host = host
+        self._commands = commands
         self._serial_number = serial_number
         self._get_percentage = get_percentage
         self._get_timeout = get_timeout
@@ -245,6 +828,17 @@ class WattrixModeSelect(CoordinatorEntity, SelectEntity):
         # Načítaj preklady pri pridaní entity
         await self._load_translations()
         self.async_write_ha_state()
+        self.async_on_remove(
+            self._hass.bus.async_listen(EVENT_CORE_CONFIG_UPDATE, self._async_core_config_updated)
+        )
+
+    async def _async_core_config_updated(self, event):
+        """Reload option labels when the HA language changes."""
+        if "language" not in event.data:
+            return
+        async_invalidate_translated_options(self._hass.config.language)
+        await self._load_translations()
+        self.async_write_ha_state()
 
     async def _load_translations(self):
         """Load translations for current language."""
@@ -265,7 +859,7 @@ class WattrixModeSelect(CoordinatorEntity, SelectEntity):
 
     @property
     def available(self) -> bool:
-        return self.coordinator.last_update_success
+        return self.coordinator.available
 
     async def async_select_option(self, option: str) -> None:
         if option not in self._attr_options:
@@ -281,21 +875,19 @@ class WattrixModeSelect(CoordinatorEntity, SelectEntity):
 
         _LOGGER.info(f"Setting mode to {option} with power_limit_percentage={power_limit_percentage}, timeout_seconds={timeout_seconds}, setpoint={setpoint}, target_temperature={target_temperature}, minimal_temperature={minimal_temperature}, minimal_temperature_recovery_delta={minimal_temperature_recovery_delta}")
 
-        success = await self._host.async_set_mode(
-            option,
-            power_limit_percentage,
-            timeout_seconds,
-            setpoint,
+        success = await self._commands.async_set_mode(
+            mode=option,
+            power_limit_percentage=power_limit_percentage,
+            timeout_seconds=timeout_seconds,
+            setpoint=setpoint,
             target_temperature=target_temperature,
             minimal_temperature=minimal_temperature,
             temperature_recovery_delta=minimal_temperature_recovery_delta
         )
 
         if success:
+            # Potvrdený stav zapíše koordinátor z odpovede zariadenia
             _LOGGER.info(f"Mode changed to {option}")
-            self.coordinator.data.update({self.entity_description.key: option})
-            self.async_write_ha_state()
-            await self.coordinator.async_request_refresh()
         else:
             _LOGGER.error(f"Failed to set mode to {option}")
 
@@ -321,16 +913,14 @@ class WattrixPercentageNumber(NumberEntity):
         self._attr_step = 1
         self._attr_native_unit_of_measurement = "%"
         self._attr_unique_id = f"wattrix_mode_percentage_{serial_number}"
-        self.coordinator.data["power_limit_percentage_to_set"] = initial_value
+        self.coordinator.staged.setdefault("power_limit_percentage_to_set", initial_value)
 
     @property
     def native_value(self):
-        if self.coordinator.data is None:
-            return None
-        return self.coordinator.data.get("power_limit_percentage_to_set", 100)
+        return self.coordinator.staged.get("power_limit_percentage_to_set", 100)
 
     async def async_set_native_value(self, value):
-        self.coordinator.data["power_limit_percentage_to_set"] = value
+        self.coordinator.staged.async_set("power_limit_percentage_to_set", value)
 
 class WattrixTimeoutNumber(NumberEntity):
     def __init__(self, host, serial_number, coordinator, initial_value=300):
@@ -342,16 +932,14 @@ class WattrixTimeoutNumber(NumberEntity):
         self._attr_native_step = 10
         self._attr_native_unit_of_measurement = "s"
         self._attr_unique_id = f"wattrix_mode_timeout_{serial_number}"
-        self.coordinator.data["timeout_seconds_to_set"] = initial_value
+        self.coordinator.staged.setdefault("timeout_seconds_to_set", initial_value)
 
     @property
     def native_value(self):
-        if self.coordinator.data is None:
-            return None
-        return self.coordinator.data.get("timeout_seconds_to_set", 300)
+        return self.coordinator.staged.get("timeout_seconds_to_set", 300)
 
     async def async_set_native_value(self, value):
-        self.coordinator.data["timeout_seconds_to_set"] = value
+        self.coordinator.staged.async_set("timeout_seconds_to_set", value)
 
 class WatttrixTemperatureNumber(NumberEntity):
     def __init__(self, host, serial_number, coordinator, key, name, initial_value=30, min_value=0, max_value=70):
@@ -364,16 +952,14 @@ class WatttrixTemperatureNumber(NumberEntity):
         self._attr_native_unit_of_measurement = "°C"
         self._attr_unique_id = f"wattrix_{key}_{serial_number}"
         self._key = f"{key}"
-        self.coordinator.data[key] = initial_value
+        self.coordinator.staged.setdefault(key, initial_value)
 
     @property
     def native_value(self):
-        if self.coordinator.data is None:
-            return None
-        return self.coordinator.data.get(self._key, None)
+        return self.coordinator.staged.get(self._key)
 
     async def async_set_native_value(self, value):
-        self.coordinator.data[self._key] = value
+        self.coordinator.staged.async_set(self._key, value)
 
 class WattrixSetpointNumber(NumberEntity):
     def __init__(self, host, serial_number, coordinator, initial_value=200):
@@ -385,91 +971,154 @@ class WattrixSetpointNumber(NumberEntity):
         self._attr_native_step = 10
         self._attr_native_unit_of_measurement = "W"
         self._attr_unique_id = f"wattrix_mode_setpoint_{serial_number}"
-        self.coordinator.data["setpoint_to_set"] = initial_value
+        self.coordinator.staged.setdefault("setpoint_to_set", initial_value)
 
     @property
     def native_value(self):
-        return self.coordinator.data.get("setpoint_to_set", 200)
+        return self.coordinator.staged.get("setpoint_to_set", 200)
 
     async def async_set_native_value(self, value):
-        self.coordinator.data["setpoint_to_set"] = value
+        self.coordinator.staged.async_set("setpoint_to_set", value)
 
-class WattrixSerialNumberCoordinator(DataUpdateCoordinator):
-    def __init__(self, hass, host):
-        self._host = host
-        super().__init__(
-            hass,
-            _LOGGER,
-            name="Wattrix Serial Number Coordinator",
-            update_interval=timedelta(seconds=15),
+class WattrixLiveSetpointNumber(NumberEntity):
+    """Regulation setpoint streamed over the websocket for closed-loop surplus control.
+
+    The state is the setpoint the device reports, so a fast regulation loop
+    writes one state per device confirmation, not one per submitted value.
+    """
+
+    _attr_mode = NumberMode.BOX
+
+    def __init__(self, coordinator, stream, serial_number):
+        self.coordinator = coordinator
+        self._stream = stream
+        self._attr_name = "Wattrix Live Setpoint"
+        self._attr_native_min_value = 0
+        self._attr_native_max_value = 10000
+        self._attr_native_step = 1
+        self._attr_native_unit_of_measurement = "W"
+        self._attr_unique_id = f"wattrix_live_setpoint_{serial_number}"
+
+    @property
+    def available(self):
+        # Bez websocketu sa hodnota nemá ako dostať do zariadenia
+        return self.coordinator.available and self.coordinator.push_connected
+
+    @property
+    def native_value(self):
+        return self.coordinator.data.get("setpoint")
+
+    @property
+    def extra_state_attributes(self):
+        return self._stream.as_dict()
+
+    async def async_set_native_value(self, value):
+        if not self.coordinator.push_connected:
+            raise HomeAssistantError("Wattrix websocket is not connected, the live setpoint cannot be sent")
+        self._stream.async_submit(value)
+
+    async def async_added_to_hass(self):
+        self.async_on_remove(
+            self.coordinator.async_add_listener(self.async_write_ha_state, frozenset({"setpoint", PUSH_KEY}))
         )
+        self.async_on_remove(self._stream.async_add_listener(self.async_write_ha_state))
 
-    async def _async_update_data(self):
-        """Fetch data from Wattrix."""
-        try:
-            async with async_timeout.timeout(10):
-                data = await self._host.async_get_serial_number()
-                return data
-        except Exception as err:
-            raise UpdateFailed(f"Error fetching data: {err}") from err
+    @property
+    def should_poll(self):
+        return False
 
 
+class WattrixLatencySensor(SensorEntity):
+    """Diagnostic p95 latency of one device endpoint, with the full metrics as attributes."""
 
-class WattrixSerialNumberSensor(Entity):
-    def __init__(self, coordinator: WattrixSerialNumberCoordinator, serial_number):
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_native_unit_of_measurement = "ms"
+    _attr_state_class = "measurement"
+
+    def __init__(self, coordinator, serial_number, endpoint):
         self.coordinator = coordinator
-        self._attr_name = "Wattrix Serial Number"
-        self._attr_unique_id = f"wattrix_serial_{serial_number}"
+        self._endpoint = endpoint
+        self._attr_name = f"Wattrix {endpoint.replace('_', ' ').title()} Latency"
+        self._attr_unique_id = f"wattrix_latency_{endpoint}_{serial_number}"
 
     @property
-    def state(self):
-        return self.coordinator.data.get("serial_number")
+    def native_value(self):
+        return self.coordinator.host.metrics.get(self._endpoint).percentiles_ms()["latency_p95_ms"]
 
     @property
-    def available(self):
-        return self.coordinator.last_update_success
+    def extra_state_attributes(self):
+        return self.coordinator.host.metrics.get(self._endpoint).as_dict(dt_util.utcnow())
 
-    async def async_update(self):
-        await self.coordinator.async_request_refresh()
+    async def async_added_to_hass(self):
+        self.async_on_remove(
+            self.coordinator.async_add_listener(self.async_write_ha_state)
+        )
 
+    @property
+    def should_poll(self):
+        return False
 
-class WattrixVersionCoordinator(DataUpdateCoordinator):
-    def __init__(self, hass, host):
-        self._host = host
-        super().__init__(
-            hass,
-            _LOGGER,
-            name="Wattrix Version Coordinator",
-            update_interval=timedelta(seconds=15),
-        )
 
-    async def _async_update_data(self):
-        """Fetch data from Wattrix."""
-        try:
-            async with async_timeout.timeout(10):
-                data = await self._host.async_get_version()
-                return data
-        except Exception as err:
-            raise UpdateFailed(f"Error fetching data: {err}") from err
+class WattrixDataAgeSensor(SensorEntity):
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_native_unit_of_measurement = "s"
+    _attr_state_class = "measurement"
 
-class WattrixDeviceStateCoordinator(DataUpdateCoordinator):
-    def __init__(self, hass, host):
-        self._host = host
-        super().__init__(
-            hass,
-            _LOGGER,
-            name="Wattrix Device State Coordinator",
-            update_interval=timedelta(seconds=15),
+    def __init__(self, coordinator, serial_number):
+        self.coordinator = coordinator
+        self._attr_name = "Wattrix Data Age"
+        self._attr_unique_id = f"wattrix_data_age_{serial_number}"
+
+    @property
+    def native_value(self):
+        age = self.coordinator.data_age
+        return round(age, 1) if age is not None else None
+
+    async def async_added_to_hass(self):
+        self.async_on_remove(
+            self.coordinator.async_add_listener(self.async_write_ha_state)
         )
 
-    async def _async_update_data(self):
-        """Fetch data from Wattrix."""
-        try:
-            async with async_timeout.timeout(10):
-                data = await self._host.async_get_device_info()
-                return data
-        except Exception as err:
-            raise UpdateFailed(f"Error fetching data: {err}") from err
+    @property
+    def should_poll(self):
+        return False
+
+
+class WattrixFleetSensor(SensorEntity):
+    """Sum of one value over every Wattrix device, maintained incrementally by the fleet."""
+
+    def __init__(self, fleet, key, name, unit, device_class, state_class, daily=False):
+        self._fleet = fleet
+        self._key = key
+        self._daily = daily
+        self._attr_name = name
+        self._attr_unique_id = f"wattrix_fleet_{key}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_device_class = device_class
+        self._attr_state_class = state_class
+
+    @property
+    def native_value(self):
+        return round(self._fleet.totals[self._key], 3)
+
+    @property
+    def last_reset(self):
+        # Denný súčet začína o polnoci; zariadenia, ktoré vynulujú počítadlo neskôr, ho len znížia
+        return dt_util.start_of_local_day() if self._daily else None
+
+    async def async_added_to_hass(self):
+        self.async_on_remove(self._fleet.async_add_listener(self._handle_fleet_update))
+
+    @callback
+    def _handle_fleet_update(self, key):
+        if key == self._key:
+            self.async_write_ha_state()
+
+    @property
+    def should_poll(self):
+        return False
 
 
 class WattrixHeatingEnergySensor(SensorEntity):
@@ -491,13 +1140,19 @@ class WattrixHeatingEnergySensor(SensorEntity):
             return None
         return self.coordinator.data.get(self._key)
 
+    @property
+    def extra_state_attributes(self):
+        if self._key in self.coordinator.stale_keys:
+            return {"stale": True, "restored": self.coordinator.restored}
+        return None
+
     @property
     def available(self):
-        return self.coordinator.last_update_success
+        return self.coordinator.available
 
     async def async_added_to_hass(self):
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.async_add_listener(self.async_write_ha_state, self._key)
         )
 
     @property
@@ -505,115 +1160,139 @@ class WattrixHeatingEnergySensor(SensorEntity):
         return False
 
 
-class WattrixSensorDataUpdateCoordinator(DataUpdateCoordinator):
-    def __init__(self, hass, host):
-        self._host = host
-        super().__init__(
-            hass,
-            _LOGGER,
-            name="Wattrix data coordinator",
-            update_interval=timedelta(seconds=15),
-        )
+class WattrixIntegratedEnergySensor(SensorEntity):
+    """Locally integrated heating energy; its statistics are imported hourly by the integrator."""
 
-        self.data = {
-            "mode": "DISABLED_HEATING",
-            "power_limit_percentage": 100,
-            "timeout_seconds": 900,
-            "power_limit_percentage_to_set": 100,
-            "timeout_seconds_to_set": 900,
-            "setpoint": 200,
-            "setpoint_to_set": 200,
-            # nové kľúče
-            "heating_energy_total": None,
-            "heating_energy_daily": None,
-            "heating_state": None,
-            "active_power": None
-        }
-
-    async def _async_update_data(self):
-        """Fetch data from Wattrix."""
-        try:
-            async with async_timeout.timeout(10):
-                status = await self._host.async_get_status()
-                if not status:
-                    raise UpdateFailed("No data received from Wattrix")
-
-                # načítaj nové REST API senzory
-                total = await self._host.async_get_sensor("energy_total_kwh")
-                daily = await self._host.async_get_sensor("energy_today_kwh")
-                heating_state = await self._host.async_get_sensor("heating_state")
-                active_power = await self._host.async_get_sensor("active_power")
-
-                self.data.update(status)
-                if total:
-                    self.data["energy_total_kwh"] = total.get("value")
-                if daily:
-                    self.data["energy_today_kwh"] = daily.get("value")
-                if active_power:
-                    self.data["active_power"] = active_power.get("value")
-                if heating_state:
-                    raw_val = str(heating_state.get('value', 'FALSE')).strip().upper()
-                    self.data['heating_state'] = (raw_val == "TRUE")
-
-                _LOGGER.info(f"Fetched data: {self.data}")
-                return self.data
-
-        except Exception as err:
-            _LOGGER.warning("Wattrix communication failed: %s", err)
-            raise UpdateFailed(f"Error fetching data: {err}") from err
-
-
-
-
-class WattrixScheduleSensor(SensorEntity):
-    def __init__(self, coordinator, serial_number):
-        self.coordinator = coordinator
-        self._attr_name = "Wattrix Schedule"
-        self._attr_unique_id = f"wattrix_schedule_{serial_number}"
+    def __init__(self, integrator, serial_number):
+        self._integrator = integrator
+        self._serial_number = serial_number
+        self._attr_name = "Wattrix Heating Energy Integrated"
+        self._attr_unique_id = f"wattrix_energy_integrated_{serial_number}"
+        self._attr_native_unit_of_measurement = "kWh"
+        self._attr_device_class = "energy"
+        # Zámerne bez state_class - hodinové súčty idú do externej štatistiky wattrix:<serial>_energy,
+        # recorder z entity nič nepočíta
 
     @property
     def native_value(self):
-        """Return count of slots in upcoming week."""
-        return len(self._get_upcoming_slots())
+        total = self._integrator.total_kwh
+        return round(total, 3) if total is not None else None
 
     @property
     def extra_state_attributes(self):
         return {
-            "schedule": self._get_upcoming_slots()
+            "last_drift_kwh": self._integrator.last_drift_kwh,
+            "pending_hours": self._integrator.pending_hours,
         }
 
-    def _get_upcoming_slots(self):
-        schedule = self.coordinator.data or []
-        _LOGGER.info(f"Fetched schedule: {schedule}")
-        return schedule
+    async def async_added_to_hass(self):
+        self._integrator.async_set_statistic(energy_statistic_id(self._serial_number), self.name)
+        # Stav sa zapisuje len po uzavretí hodiny, nie pri každej vzorke
+        self.async_on_remove(self._integrator.async_add_listener(self.async_write_ha_state))
+
+    @property
+    def should_poll(self):
+        return False
+
+
+class WattrixScheduleEntity(SensorEntity):
+    """Base of the schedule sensors.
+
+    The state is evaluated from the coordinator's schedule index when the
+    schedule changes and exactly at the next slot start or end, so slot
+    transitions need neither polling nor extra device requests.
+    """
+
+    def __init__(self, coordinator, serial_number, name, unique_id):
+        self.coordinator = coordinator
+        self._attr_name = name
+        self._attr_unique_id = f"{unique_id}_{serial_number}"
+        self._written_state = None
+        self._unsub_boundary = None
+
+    def _evaluate(self, index, now):
+        """Return (state, attributes) at now; subclasses pick what they show from the index."""
+        return None, {}
 
     async def async_added_to_hass(self):
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.async_add_listener(self._handle_schedule_update, "schedule")
         )
+        self.async_on_remove(self._cancel_boundary)
+        # Prvý zápis stavu urobí platforma po pridaní entity
+        self._async_evaluate()
+
+    @callback
+    def _async_evaluate(self) -> bool:
+        """Recompute the state and arm the next boundary; return True when the state changed."""
+        now = dt_util.utcnow()
+        index = self.coordinator.schedule_index
+        self._cancel_boundary()
+        boundary = index.next_boundary(now)
+        if boundary is not None:
+            self._unsub_boundary = async_track_point_in_time(self.hass, self._handle_schedule_update, boundary)
+
+        state = self._evaluate(index, now)
+        if state == self._written_state:
+            return False
+        self._written_state = state
+        self._attr_native_value, self._attr_extra_state_attributes = state
+        return True
+
+    @callback
+    def _handle_schedule_update(self, _now=None):
+        if self._async_evaluate():
+            self.async_write_ha_state()
+
+    @callback
+    def _cancel_boundary(self):
+        if self._unsub_boundary is not None:
+            self._unsub_boundary()
+            self._unsub_boundary = None
 
     @property
     def should_poll(self):
         return False
 
 
-class WattrixScheduleCoordinator(DataUpdateCoordinator):
-    def __init__(self, hass, host):
-        self._host = host
+class WattrixScheduleSensor(WattrixScheduleEntity):
+    """Number of slots that have not ended yet."""
+
+    def __init__(self, coordinator, serial_number):
+        super().__init__(coordinator, serial_number, "Wattrix Schedule", "wattrix_schedule")
+
+    def _evaluate(self, index, now):
+        # Celý rozvrh je dostupný cez službu wattrix.get_schedule, nie v stave
+        return index.upcoming_count(now), {
+            "current_slot": index.current_slot(now),
+            "next_slot": index.next_slot(now),
+            "schedule_revision": self.coordinator.schedule_revision or self.coordinator.schedule_hash,
+        }
+
+
+class WattrixScheduleSlotSensor(WattrixScheduleEntity):
+    """Mode of the current or the next slot; the other slot fields are attributes."""
+
+    def __init__(self, coordinator, serial_number, which):
+        self._which = which
         super().__init__(
-            hass,
-            _LOGGER,
-            name="Wattrix Schedule Coordinator",
-            update_interval=timedelta(minutes=1),  # napr. každých 5 minút
+            coordinator, serial_number, f"Wattrix {which.capitalize()} Slot", f"wattrix_schedule_{which}_slot"
         )
+        self._attr_icon = "mdi:calendar-clock"
 
-    async def _async_update_data(self):
-        """Fetch schedule from Wattrix."""
-        try:
-            async with async_timeout.timeout(10):
-                data = await self._host.async_get_schedule(hours=24*7)
-                if not data or "schedule" not in data:
-                    raise UpdateFailed("No schedule data received from Wattrix")
-                return data["schedule"]   # rovno vráti list slotov
-        except Exception as err:
-            raise UpdateFailed(f"Error fetching schedule: {err}") from err
\ No newline at end of file
+    def _evaluate(self, index, now):
+        slot = index.current_slot(now) if self._which == "current" else index.next_slot(now)
+        if slot is None:
+            return None, {}
+        return slot.get("mode"), {key: value for key, value in slot.items() if key != "mode"}
+
+
+class WattrixNextSlotChangeSensor(WattrixScheduleEntity):
+    """Time of the next slot start or end; the frontend shows it as time remaining."""
+
+    def __init__(self, coordinator, serial_number):
+        super().__init__(coordinator, serial_number, "Wattrix Next Slot Change", "wattrix_schedule_next_change")
+        self._attr_device_class = "timestamp"
+
+    def _evaluate(self, index, now):
+        return index.next_boundary(now), {}
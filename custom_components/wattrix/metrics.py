@@ -0,0 +1,77 @@
+from collections import deque
+
+# Počet posledných meraní, z ktorých sa počítajú percentily
+LATENCY_SAMPLES = 200
+
+
+def _percentile(sorted_samples, percentile):
+    if not sorted_samples:
+        return None
+    index = min(len(sorted_samples) - 1, int(round(percentile / 100 * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+class WattrixEndpointMetrics:
+    """Latency, error and payload counters of one device endpoint."""
+
+    def __init__(self):
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.last_payload_bytes = None
+        self.total_payload_bytes = 0
+        self.last_success = None
+        self.last_error = None
+
+    def record_success(self, latency: float, payload_bytes: int, now) -> None:
+        self.requests += 1
+        self.latencies.append(latency)
+        self.last_payload_bytes = payload_bytes
+        self.total_payload_bytes += payload_bytes
+        self.last_success = now
+
+    def record_error(self, latency: float, error: str, timeout: bool = False) -> None:
+        self.requests += 1
+        self.errors += 1
+        if timeout:
+            self.timeouts += 1
+        self.latencies.append(latency)
+        self.last_error = error
+
+    def percentiles_ms(self) -> dict:
+        samples = sorted(self.latencies)
+        result = {}
+        for percentile in (50, 95, 99):
+            value = _percentile(samples, percentile)
+            result[f"latency_p{percentile}_ms"] = round(value * 1000, 1) if value is not None else None
+        return result
+
+    def as_dict(self, now) -> dict:
+        successes = self.requests - self.errors
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            **self.percentiles_ms(),
+            "payload_bytes_last": self.last_payload_bytes,
+            "payload_bytes_avg": round(self.total_payload_bytes / successes) if successes else None,
+            "data_age_s": round((now - self.last_success).total_seconds(), 1) if self.last_success else None,
+            "last_error": self.last_error,
+        }
+
+
+class WattrixMetrics:
+    """Per-endpoint metrics of one Wattrix device."""
+
+    def __init__(self):
+        self._endpoints = {}
+
+    def get(self, endpoint: str) -> WattrixEndpointMetrics:
+        metrics = self._endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self._endpoints[endpoint] = WattrixEndpointMetrics()
+        return metrics
+
+    def as_dict(self, now) -> dict:
+        return {endpoint: metrics.as_dict(now) for endpoint, metrics in self._endpoints.items()}
@@ -0,0 +1,84 @@
+import logging
+from datetime import timedelta
+
+_LOGGER = logging.getLogger(__name__)
+
+# Prvé pollovanie každého endpointu sa posunie o tento krok, aby nešli naraz
+STAGGER_STEP = timedelta(seconds=2)
+# Endpointy splatné v tomto okne sa zlúčia do jedného prebudenia
+COALESCE_WINDOW = timedelta(seconds=1)
+MIN_WAKEUP = timedelta(seconds=1)
+IDLE_WAKEUP = timedelta(seconds=60)
+
+
+class WattrixPollEndpoint:
+    def __init__(self, name: str, interval: timedelta):
+        self.name = name
+        self.interval = interval
+        self.paused = False
+        self.next_due = None
+
+
+class WattrixPollScheduler:
+    """Keeps the cadence of every endpoint of one device and tells the coordinator when to wake up."""
+
+    def __init__(self, phase: timedelta = timedelta(0)):
+        # Posun fázy voči ostatným zariadeniam vo fleete
+        self._phase = phase
+        self._endpoints = {}
+
+    def add(self, name: str, interval: timedelta, now) -> WattrixPollEndpoint:
+        """Register an endpoint; registering the same endpoint again keeps the faster cadence."""
+        endpoint = self._endpoints.get(name)
+        if endpoint is not None:
+            endpoint.interval = min(endpoint.interval, interval)
+            return endpoint
+
+        endpoint = WattrixPollEndpoint(name, interval)
+        endpoint.next_due = now + self._phase + STAGGER_STEP * len(self._endpoints)
+        self._endpoints[name] = endpoint
+        return endpoint
+
+    def get(self, name: str) -> WattrixPollEndpoint:
+        return self._endpoints[name]
+
+    def due(self, now) -> list:
+        horizon = now + COALESCE_WINDOW
+        return [
+            endpoint for endpoint in self._endpoints.values()
+            if not endpoint.paused and endpoint.next_due <= horizon
+        ]
+
+    def mark_polled(self, name: str, now) -> None:
+        """Move the endpoint to its next slot, keeping its phase unless it fell behind."""
+        endpoint = self._endpoints[name]
+        next_due = endpoint.next_due + endpoint.interval
+        if next_due <= now:
+            next_due = now + endpoint.interval
+        endpoint.next_due = next_due
+
+    def mark_due(self, name: str, now) -> None:
+        self._endpoints[name].next_due = now
+
+    def set_interval(self, name: str, interval: timedelta, now) -> None:
+        endpoint = self._endpoints[name]
+        if endpoint.interval == interval:
+            return
+        _LOGGER.debug("Wattrix %s poll interval %s -> %s", name, endpoint.interval, interval)
+        # Pri skrátení intervalu nečakaj na starý termín
+        endpoint.next_due = min(endpoint.next_due, now + interval)
+        endpoint.interval = interval
+
+    def pause(self, name: str) -> None:
+        self._endpoints[name].paused = True
+
+    def resume(self, name: str, now) -> None:
+        endpoint = self._endpoints[name]
+        endpoint.paused = False
+        endpoint.next_due = now
+
+    def next_wakeup(self, now) -> timedelta:
+        active = [endpoint.next_due for endpoint in self._endpoints.values() if not endpoint.paused]
+        if not active:
+            return IDLE_WAKEUP
+        return max(min(active) - now, MIN_WAKEUP)
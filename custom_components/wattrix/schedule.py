@@ -0,0 +1,75 @@
+from bisect import bisect_right
+from datetime import datetime
+
+from homeassistant.util import dt as dt_util
+
+# Slot bez konca trvá, kým ho rozvrh nenahradí
+_OPEN_END = datetime.max.replace(tzinfo=dt_util.UTC)
+
+
+def parse_slot_time(value):
+    parsed = dt_util.parse_datetime(str(value or ""))
+    return dt_util.as_utc(parsed) if parsed is not None else None
+
+
+def slot_ended(slot, now) -> bool:
+    end = parse_slot_time(slot.get("end"))
+    return end is not None and end <= now
+
+
+class WattrixScheduleIndex:
+    """Schedule parsed once into sorted start/end lists that are searched with bisect.
+
+    The index belongs to one schedule list; the coordinator builds a new index
+    only when the schedule itself is replaced.
+    """
+
+    __slots__ = ("schedule", "_slots", "_starts", "_ends", "_max_ends", "_sorted_ends", "_boundaries")
+
+    def __init__(self, schedule=()):
+        self.schedule = schedule
+        parsed = []
+        for slot in schedule or ():
+            start = parse_slot_time(slot.get("start"))
+            if start is None:
+                continue
+            parsed.append((start, parse_slot_time(slot.get("end")) or _OPEN_END, slot))
+        # Stabilné triedenie zachová poradie zariadenia pri rovnakom začiatku
+        parsed.sort(key=lambda item: item[0])
+
+        self._slots = [slot for _start, _end, slot in parsed]
+        self._starts = [start for start, _end, _slot in parsed]
+        self._ends = [end for _start, end, _slot in parsed]
+        # Najneskorší koniec zo slotov 0..i; ak už uplynul, žiadny z nich nebeží
+        self._max_ends = []
+        latest = None
+        for end in self._ends:
+            latest = end if latest is None or end > latest else latest
+            self._max_ends.append(latest)
+        self._sorted_ends = sorted(self._ends)
+        self._boundaries = sorted({*self._starts, *(end for end in self._ends if end is not _OPEN_END)})
+
+    def __len__(self):
+        return len(self._slots)
+
+    def current_slot(self, now):
+        """Return the latest started slot that has not ended yet."""
+        index = bisect_right(self._starts, now) - 1
+        while index >= 0 and self._max_ends[index] > now:
+            if self._ends[index] > now:
+                return self._slots[index]
+            index -= 1
+        return None
+
+    def next_slot(self, now):
+        index = bisect_right(self._starts, now)
+        return self._slots[index] if index < len(self._slots) else None
+
+    def upcoming_count(self, now) -> int:
+        """Number of slots that have not ended yet."""
+        return len(self._sorted_ends) - bisect_right(self._sorted_ends, now)
+
+    def next_boundary(self, now):
+        """Return the first slot start or end after now, or None past the last slot."""
+        index = bisect_right(self._boundaries, now)
+        return self._boundaries[index] if index < len(self._boundaries) else None
@@ -5,38 +5,31 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN
-from .helpers import WattrixDataUpdateCoordinator, get_device_serial, WattrixModeSelect, WATTRIX_MODE_SELECT_DESCRIPTION
+from .helpers import WattrixModeSelect, WATTRIX_MODE_SELECT_DESCRIPTION
 
 
 _LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback):
-    host = hass.data[DOMAIN][entry.entry_id]["host"]
-
-    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
-    await coordinator.async_refresh()
-
-    serial_number = await get_device_serial(host._base_url)
-    if serial_number and len(serial_number) > 0:
-        _LOGGER.info("Using serial number: %s", serial_number)
-    else:
-        _LOGGER.error("No serial number found for Wattrix device.")
-        return False
-
-    state = await host.async_get_status()
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    host = entry_data["host"]
+    coordinator = entry_data["coordinator"]
+    serial_number = entry_data["serial_number"]
+    state = entry_data["bootstrap"]["status"] or coordinator.data
 
     entity = WattrixModeSelect(
         coordinator=coordinator,
         description=WATTRIX_MODE_SELECT_DESCRIPTION,
         host=host,
+        commands=entry_data["commands"],
         serial_number=serial_number,
         initial_state=state.get("mode", "UNRESTRICTED_HEATING"),
-        get_percentage=lambda: coordinator.data.get("power_limit_percentage_to_set", 100),
-        get_timeout=lambda: coordinator.data.get("timeout_seconds_to_set", 900),
-        get_setpoint=lambda: coordinator.data.get("setpoint_to_set", None),
-        get_target_temperature=lambda: coordinator.data.get("target_temperature_to_set", None),
-        get_minimal_temperature=lambda: coordinator.data.get("minimal_temperature_to_set", None),
-        get_minimal_temperature_recovery_delta=lambda: coordinator.data.get("minimal_temperature_recovery_delta_to_set", None)
+        get_percentage=lambda: coordinator.staged.get("power_limit_percentage_to_set", 100),
+        get_timeout=lambda: coordinator.staged.get("timeout_seconds_to_set", 900),
+        get_setpoint=lambda: coordinator.staged.get("setpoint_to_set", None),
+        get_target_temperature=lambda: coordinator.staged.get("target_temperature_to_set", None),
+        get_minimal_temperature=lambda: coordinator.staged.get("minimal_temperature_to_set", None),
+        get_minimal_temperature_recovery_delta=lambda: coordinator.staged.get("minimal_temperature_recovery_delta_to_set", None)
     )
 
     async_add_entities([entity])
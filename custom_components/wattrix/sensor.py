@@ -2,12 +2,14 @@ import logging
 
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from custom_components.wattrix import DOMAIN
-from custom_components.wattrix.helpers import WattrixDataUpdateCoordinator, WattrixSerialNumberCoordinator, get_device_serial, WattrixSensor, WattrixVersionCoordinator, WattrixDeviceStateCoordinator, \
-    WattrixOnlineSensor, WattrixSensorDataUpdateCoordinator, WattrixHeatingEnergySensor, WattrixScheduleCoordinator, WattrixScheduleSensor
+from custom_components.wattrix.helpers import WattrixSensor, WattrixOnlineSensor, WattrixHeatingEnergySensor, WattrixScheduleSensor, \
+    WattrixLatencySensor, WattrixDataAgeSensor, WattrixFleetSensor, WattrixIntegratedEnergySensor, \
+    WattrixScheduleSlotSensor, WattrixNextSlotChangeSensor
+from custom_components.wattrix.fleet import async_get_fleet
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -17,22 +19,9 @@ _LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback):
     """Set up Wattrix sensors from a config entry."""
-    host = hass.data[DOMAIN][entry.entry_id]["host"]
-    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
-
-
-    serial_number = await get_device_serial(host._base_url)
-    if serial_number and len(serial_number) > 0:
-        _LOGGER.info("Using serial number: %s", serial_number)
-    else:
-        _LOGGER.error("No serial number found for Wattrix device.")
-        return False
-
-    serial_coordinator = WattrixSerialNumberCoordinator(hass, host)
-    version_coordinator = WattrixVersionCoordinator(hass, host)
-    device_info_coordinator = WattrixDeviceStateCoordinator(hass, host)
-    sensors_coordinator = WattrixSensorDataUpdateCoordinator(hass, host)
-    schedule_coordinator = WattrixScheduleCoordinator(hass, host)
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    coordinator = entry_data["coordinator"]
+    serial_number = entry_data["serial_number"]
 
     sensors = [
         WattrixSensor(coordinator, "Wattrix Current Power", "current_power", serial_number, "W"),
@@ -45,19 +34,41 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
         WattrixSensor(coordinator, "Wattrix Minimal Temperature", "minimal_temperature", serial_number, "°C"),
         WattrixSensor(coordinator, "Wattrix Temperature Recovery Delta", "temperature_recovery_delta", serial_number, "°C"),
         WattrixSensor(coordinator, "Wattrix Heating Override", "heating_override", serial_number),
-        WattrixSensor(serial_coordinator, "Wattrix Serial Number", "serial_number", serial_number),
-        WattrixSensor(version_coordinator, "Wattrix Version", "version", serial_number),
-        WattrixSensor(device_info_coordinator, "Wattrix Internal Temperature", "thermal_sensor", serial_number, "°C"),
-        WattrixHeatingEnergySensor(sensors_coordinator, serial_number, "energy_total_kwh", "Wattrix Heating Energy Total"),
-        WattrixHeatingEnergySensor(sensors_coordinator, serial_number, "energy_today_kwh", "Wattrix Heating Energy Daily"),
-        WattrixSensor(sensors_coordinator, "Wattrix Heating State", "heating_state", serial_number),
-        WattrixSensor(sensors_coordinator, "Wattrix Active Power", "active_power", serial_number, unit="W"),
-        WattrixScheduleSensor(schedule_coordinator, serial_number),
+        WattrixSensor(coordinator, "Wattrix Serial Number", "serial_number", serial_number),
+        WattrixSensor(coordinator, "Wattrix Version", "version", serial_number),
+        WattrixSensor(coordinator, "Wattrix Internal Temperature", "thermal_sensor", serial_number, "°C"),
+        WattrixHeatingEnergySensor(coordinator, serial_number, "energy_total_kwh", "Wattrix Heating Energy Total"),
+        WattrixHeatingEnergySensor(coordinator, serial_number, "energy_today_kwh", "Wattrix Heating Energy Daily"),
+        WattrixIntegratedEnergySensor(entry_data["energy"], serial_number),
+        WattrixSensor(coordinator, "Wattrix Heating State", "heating_state", serial_number),
+        WattrixSensor(coordinator, "Wattrix Active Power", "active_power", serial_number, unit="W"),
+        WattrixScheduleSensor(coordinator, serial_number),
+        WattrixScheduleSlotSensor(coordinator, serial_number, "current"),
+        WattrixScheduleSlotSensor(coordinator, serial_number, "next"),
+        WattrixNextSlotChangeSensor(coordinator, serial_number),
         WattrixOnlineSensor(coordinator, serial_number),
+        WattrixDataAgeSensor(coordinator, serial_number),
     ]
+    sensors.extend(
+        WattrixLatencySensor(coordinator, serial_number, endpoint)
+        for endpoint in ("status", "sensors", "device_info", "schedule", "mode", "mode_confirm", "setpoint")
+    )
 
     async_add_entities(sensors)
 
+    @callback
+    def _async_add_fleet_sensors():
+        async_add_entities([
+            WattrixFleetSensor(fleet, "active_power", "Wattrix Fleet Active Power", "W", "power", "measurement"),
+            WattrixFleetSensor(fleet, "energy_total_kwh", "Wattrix Fleet Heating Energy Total", "kWh", "energy", "total"),
+            WattrixFleetSensor(fleet, "energy_today_kwh", "Wattrix Fleet Heating Energy Daily", "kWh", "energy", "total",
+                               daily=True),
+        ])
+
+    # Súhrnné fleet senzory vytvorí prvé zariadenie; keď odíde, prevezme ich ďalšie
+    fleet = async_get_fleet(hass)
+    entry.async_on_unload(fleet.async_offer_sensors(entry.entry_id, _async_add_fleet_sensors))
+
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -0,0 +1,139 @@
+import logging
+
+import voluptuous as vol
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import HomeAssistant, callback, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .traffic import WattrixTrafficRecorder, write_traffic
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_GET_SCHEDULE = "get_schedule"
+SERVICE_BACKFILL_ENERGY = "backfill_energy"
+SERVICE_RECORD_TRAFFIC = "record_traffic"
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_START = "start"
+ATTR_RESTART = "restart"
+ATTR_DURATION = "duration"
+
+GET_SCHEDULE_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+})
+
+BACKFILL_ENERGY_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    vol.Optional(ATTR_START): cv.datetime,
+    vol.Optional(ATTR_RESTART, default=False): cv.boolean,
+})
+
+RECORD_TRAFFIC_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    vol.Optional(ATTR_DURATION, default=3600): vol.All(vol.Coerce(int), vol.Range(min=10, max=86400)),
+})
+
+
+async def async_setup_services(hass: HomeAssistant) -> None:
+    """Register Wattrix services."""
+
+    async def async_get_schedule(call: ServiceCall) -> ServiceResponse:
+        """Return the full schedule of every (or one) Wattrix device, keyed by serial number."""
+        entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+        schedules = {}
+        for current_entry_id, entry_data in hass.data.get(DOMAIN, {}).items():
+            if entry_id and current_entry_id != entry_id:
+                continue
+            coordinator = entry_data["coordinator"]
+            schedules[entry_data["serial_number"]] = {
+                "revision": coordinator.schedule_revision or coordinator.schedule_hash,
+                "schedule": coordinator.data.get("schedule") or [],
+            }
+        return {"devices": schedules}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_SCHEDULE,
+        async_get_schedule,
+        schema=GET_SCHEDULE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def async_backfill_energy(call: ServiceCall) -> ServiceResponse:
+        """Import stored device energy history into the hourly statistics, resuming from the checkpoint."""
+        entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+        start = call.data.get(ATTR_START)
+        if start is not None:
+            start = dt_util.as_utc(start) if start.tzinfo else start.replace(tzinfo=dt_util.get_default_time_zone())
+        results = {}
+        for current_entry_id, entry_data in hass.data.get(DOMAIN, {}).items():
+            if entry_id and current_entry_id != entry_id:
+                continue
+            results[entry_data["serial_number"]] = await entry_data["backfill"].async_run(
+                start, call.data[ATTR_RESTART]
+            )
+        return {"devices": results}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BACKFILL_ENERGY,
+        async_backfill_energy,
+        schema=BACKFILL_ENERGY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def async_record_traffic(call: ServiceCall) -> ServiceResponse:
+        """Record HTTP and websocket traffic of Wattrix devices into files for offline replay."""
+        entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+        files = {}
+        for current_entry_id, entry_data in hass.data.get(DOMAIN, {}).items():
+            if entry_id and current_entry_id != entry_id:
+                continue
+            host = entry_data["host"]
+            serial_number = entry_data["serial_number"]
+            if host.recorder is not None:
+                raise HomeAssistantError(f"Traffic of {serial_number} is already being recorded")
+            recorder = host.recorder = WattrixTrafficRecorder(serial_number)
+            path = hass.config.path(
+                f"wattrix_traffic_{serial_number}_{recorder.started.strftime('%Y%m%d%H%M%S')}.jsonl.gz"
+            )
+
+            _async_schedule_finish(
+                hass, hass.config_entries.async_get_entry(current_entry_id), host, recorder, path,
+                call.data[ATTR_DURATION],
+            )
+            files[serial_number] = path
+        return {"devices": files}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RECORD_TRAFFIC,
+        async_record_traffic,
+        schema=RECORD_TRAFFIC_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+@callback
+def _async_schedule_finish(hass, entry, host, recorder, path, duration) -> None:
+    """Write the recording after duration, or earlier when the entry unloads or Home Assistant stops."""
+
+    async def _async_finish(_now_or_event=None):
+        if host.recorder is not recorder:
+            # Už zapísané
+            return
+        host.recorder = None
+        cancel_timer()
+        await hass.async_add_executor_job(write_traffic, path, recorder.header(), recorder.events)
+        _LOGGER.info("Wattrix traffic recording with %s events written to %s", len(recorder.events), path)
+
+    cancel_timer = async_call_later(hass, duration, _async_finish)
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_finish)
+    if entry is not None:
+        # Vrátenú korutinu spustí Home Assistant pri unloade
+        entry.async_on_unload(_async_finish)
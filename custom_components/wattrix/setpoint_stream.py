@@ -0,0 +1,151 @@
+import asyncio
+import logging
+import time
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+# Najviac jedna hodnota za tento interval (5 Hz)
+SETPOINT_MIN_INTERVAL = 0.2
+# Staršia hodnota už nezodpovedá meraniu elektromera, zahodí sa
+SETPOINT_MAX_AGE = 2.0
+
+
+class WattrixSetpointStream:
+    """Streams regulation setpoints to one device over its websocket.
+
+    Only the newest value is kept: it is sent at most every
+    SETPOINT_MIN_INTERVAL and dropped when it waited longer than
+    SETPOINT_MAX_AGE. Latency is measured from submit until a pushed status
+    reports the value and recorded as the "setpoint" endpoint metrics; a value
+    the device does not confirm within SETPOINT_MAX_AGE is reported as an error.
+    """
+
+    def __init__(self, hass, coordinator):
+        self._hass = hass
+        self._coordinator = coordinator
+        self._metrics = coordinator.host.metrics.get("setpoint")
+        self._pending = None
+        self._in_flight = None
+        self._last_sent = 0.0
+        self._seq = 0
+        self._task = None
+        self.value = None
+        self.sent = 0
+        self.superseded = 0
+        self.stale = 0
+        self.failed = 0
+        self.unconfirmed = 0
+        self.last_error = None
+        self._unsub_confirm = None
+        self._listeners = []
+
+    @callback
+    def async_start(self):
+        """Watch pushed statuses for the confirmation of the value in flight."""
+        return self._coordinator.async_add_listener(self._async_check_confirmed, "setpoint")
+
+    @callback
+    def async_add_listener(self, listener):
+        """Notify listener when a value failed or was not confirmed."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    @callback
+    def async_submit(self, value) -> None:
+        """Queue a setpoint; a value not sent yet is replaced."""
+        value = round(value)
+        if self._pending is not None:
+            self.superseded += 1
+        self._pending = (value, time.monotonic())
+        self.value = value
+        if self._task is None:
+            self._task = self._hass.async_create_background_task(
+                self._async_send_loop(), name=f"{self._coordinator.name} setpoint stream"
+            )
+
+    async def _async_send_loop(self) -> None:
+        try:
+            while self._pending is not None:
+                wait = self._last_sent + SETPOINT_MIN_INTERVAL - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                value, submitted = self._pending
+                self._pending = None
+                if time.monotonic() - submitted > SETPOINT_MAX_AGE:
+                    self.stale += 1
+                    continue
+
+                self._seq += 1
+                self._last_sent = time.monotonic()
+                if await self._coordinator.async_push_send({"type": "setpoint", "value": value, "seq": self._seq}):
+                    self.sent += 1
+                    # Nezmenená hodnota nevyvolá zmenu stavu, ktorú by sme čakali
+                    if self._coordinator.data.get("setpoint") != value:
+                        self._in_flight = (value, submitted)
+                        self._cancel_confirm_timer()
+                        self._unsub_confirm = async_call_later(
+                            self._hass, SETPOINT_MAX_AGE, self._async_confirm_timeout
+                        )
+                else:
+                    self.failed += 1
+                    self._report_error(submitted, "websocket not connected")
+        finally:
+            self._task = None
+
+    @callback
+    def _async_check_confirmed(self) -> None:
+        if self._in_flight is None:
+            return
+        value, submitted = self._in_flight
+        if self._coordinator.data.get("setpoint") == value:
+            self._in_flight = None
+            self._cancel_confirm_timer()
+            self.last_error = None
+            self._metrics.record_success(time.monotonic() - submitted, 0, dt_util.utcnow())
+
+    @callback
+    def _async_confirm_timeout(self, _now) -> None:
+        self._unsub_confirm = None
+        if self._in_flight is None:
+            return
+        value, submitted = self._in_flight
+        self._in_flight = None
+        self.unconfirmed += 1
+        _LOGGER.warning("Wattrix did not confirm setpoint %s W within %s s", value, SETPOINT_MAX_AGE)
+        self._report_error(submitted, f"setpoint {value} not confirmed")
+
+    def _report_error(self, submitted, error) -> None:
+        self.last_error = error
+        self._metrics.record_error(time.monotonic() - submitted, error)
+        for listener in list(self._listeners):
+            listener()
+
+    def _cancel_confirm_timer(self) -> None:
+        if self._unsub_confirm is not None:
+            self._unsub_confirm()
+            self._unsub_confirm = None
+
+    def as_dict(self) -> dict:
+        return {
+            "value": self.value,
+            "streaming": self._coordinator.push_connected,
+            "sent": self.sent,
+            "superseded": self.superseded,
+            "stale": self.stale,
+            "failed": self.failed,
+            "unconfirmed": self.unconfirmed,
+            "last_error": self.last_error,
+            "awaiting_confirmation": self._in_flight is not None,
+        }
+
+    @callback
+    def async_shutdown(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._cancel_confirm_timer()
+        self._pending = None
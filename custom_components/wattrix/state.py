@@ -0,0 +1,90 @@
+from collections.abc import Mapping
+
+from homeassistant.core import callback
+
+_MISSING = object()
+
+# Hodnoty, ktoré sa pošlú s ďalším príkazom na zmenu režimu
+STAGED_DEFAULTS = {
+    "power_limit_percentage_to_set": 100,
+    "timeout_seconds_to_set": 900,
+    "setpoint_to_set": 200,
+}
+
+
+class WattrixSnapshot(Mapping):
+    """Immutable device state; every change produces a new snapshot.
+
+    Readers keep using the mapping interface (`.get`, `[]`, `in`), and two
+    snapshots can be diffed by identity first, so an unchanged poll costs
+    neither an allocation nor a comparison.
+    """
+
+    __slots__ = ("_values",)
+
+    def __init__(self, values=None):
+        object.__setattr__(self, "_values", dict(values) if values else {})
+
+    def __setattr__(self, name, value):
+        raise AttributeError("WattrixSnapshot is immutable")
+
+    def __getitem__(self, key):
+        return self._values[key]
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __repr__(self):
+        return f"WattrixSnapshot({self._values!r})"
+
+    def replace(self, changes) -> "WattrixSnapshot":
+        """Return a snapshot with the changes applied, or self when nothing differs."""
+        values = self._values
+        for key, value in changes.items():
+            if values.get(key, _MISSING) != value:
+                break
+        else:
+            return self
+        return WattrixSnapshot({**values, **changes})
+
+    def changed_keys(self, previous) -> set:
+        if previous is self:
+            return set()
+        values, old = self._values, previous._values
+        changed = {key for key, value in values.items() if old.get(key, _MISSING) != value}
+        changed.update(old.keys() - values.keys())
+        return changed
+
+    def as_dict(self) -> dict:
+        return dict(self._values)
+
+
+class WattrixStagedSettings:
+    """Values the user staged on the number entities, kept apart from the device state."""
+
+    def __init__(self, store=None):
+        self._store = store
+        self._values = dict(STAGED_DEFAULTS)
+        if store is not None:
+            self._values.update(store.staged)
+
+    def get(self, key, default=None):
+        return self._values.get(key, default)
+
+    @callback
+    def setdefault(self, key, value) -> None:
+        """Seed a value without persisting it; a value restored from the store wins."""
+        if self._store is None or key not in self._store.staged:
+            self._values[key] = value
+
+    @callback
+    def async_set(self, key, value) -> None:
+        self._values[key] = value
+        if self._store is not None:
+            self._store.async_set_staged(key, value)
+
+    def as_dict(self) -> dict:
+        return dict(self._values)
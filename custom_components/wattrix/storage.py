@@ -0,0 +1,108 @@
+import logging
+
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+# Snapshot stavu sa zapisuje najviac raz za minútu, pri vypnutí HA vždy
+SNAPSHOT_SAVE_DELAY = 60
+
+
+class WattrixStore:
+    """Persisted per-device data, one file per config entry."""
+
+    def __init__(self, hass, entry_id):
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+        self._data = {}
+        self._snapshot_provider = None
+        self._save_pending = False
+
+    async def async_load(self) -> None:
+        self._data = await self._store.async_load() or {}
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
+
+    @property
+    def identity(self) -> dict:
+        """Cached /serial-number and /version payloads keyed by endpoint."""
+        return self._data.get("identity", {})
+
+    @callback
+    def async_set_identity(self, endpoint: str, payload: dict) -> None:
+        identity = self._data.setdefault("identity", {})
+        if identity.get(endpoint) == payload:
+            return
+        identity[endpoint] = payload
+        self._save_pending = True
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @property
+    def snapshot(self):
+        """Last known coordinator data with the time it was saved, or None."""
+        return self._data.get("snapshot")
+
+    @property
+    def staged(self) -> dict:
+        """Values staged on the number entities for the next mode command."""
+        return self._data.get("staged", {})
+
+    @property
+    def energy(self) -> dict:
+        """State of the local energy integration."""
+        return self._data.get("energy", {})
+
+    @callback
+    def async_set_energy(self, state: dict) -> None:
+        if self._data.get("energy") == state:
+            return
+        self._data["energy"] = state
+        # Mení sa pri každej vzorke výkonu - naplánovaný zápis sa neposúva, zapíše aj túto zmenu
+        if self._save_pending:
+            return
+        self._save_pending = True
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @property
+    def backfill(self) -> dict:
+        """Checkpoint of the last energy history backfill."""
+        return self._data.get("backfill", {})
+
+    @callback
+    def async_set_backfill(self, checkpoint: dict) -> None:
+        self._data["backfill"] = checkpoint
+        self._save_pending = True
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def async_set_snapshot_provider(self, provider) -> None:
+        self._snapshot_provider = provider
+
+    @callback
+    def async_schedule_snapshot_save(self) -> None:
+        # async_delay_save by každým volaním posunul zápis - pri častých updatoch by sa nikdy nezapísal
+        if self._save_pending:
+            return
+        self._save_pending = True
+        self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def async_set_staged(self, key: str, value) -> None:
+        staged = self._data.setdefault("staged", {})
+        if staged.get(key) == value:
+            return
+        staged[key] = value
+        self._save_pending = True
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict:
+        self._save_pending = False
+        if self._snapshot_provider is not None:
+            self._data["snapshot"] = self._snapshot_provider()
+        return self._data
@@ -0,0 +1,111 @@
+"""Recording of the traffic between WattrixHost and a device.
+
+A recording is a gzip file of JSON lines. The first line is a header, every
+other line one compact event:
+
+    ["h", ms, endpoint, method, request, status, etag, body, error]   HTTP exchange
+    ["w", ms, event]                                               websocket event
+    ["c", ms, connected]                                           websocket (dis)connect
+
+ms is the time since the start of the recording and request the path with its
+sorted query string (version 1 recordings have the path only). A body equal to
+the previous body of the same request is stored as 1.
+"""
+import gzip
+import json
+import logging
+import time
+from urllib.parse import urlencode
+
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+TRAFFIC_FORMAT = "wattrix-traffic"
+TRAFFIC_VERSION = 2
+# Strop pamäte pri dlhom nahrávaní
+MAX_EVENTS = 200_000
+SAME_BODY = 1
+
+
+def request_key(path, params=None) -> str:
+    """Path with the sorted query string; recording and replay match requests on it."""
+    if not params:
+        return path
+    return f"{path}?{urlencode(sorted((key, str(value)) for key, value in params.items()))}"
+
+
+class WattrixTrafficRecorder:
+    """Collects the exchanges of one device in memory until it is written out."""
+
+    def __init__(self, serial_number):
+        self.started = dt_util.utcnow()
+        self._started = time.monotonic()
+        self._serial_number = serial_number
+        self._last_bodies = {}
+        self.events = []
+
+    @property
+    def full(self) -> bool:
+        return len(self.events) >= MAX_EVENTS
+
+    def _offset_ms(self) -> int:
+        return int((time.monotonic() - self._started) * 1000)
+
+    def record_http(self, endpoint, method, path, status, etag, body: bytes, error=None) -> None:
+        if self.full:
+            return
+        text = body.decode("utf-8", "replace") if body is not None else None
+        stored = text
+        if text is not None and self._last_bodies.get(path) == text:
+            stored = SAME_BODY
+        elif text is not None:
+            self._last_bodies[path] = text
+        self.events.append(["h", self._offset_ms(), endpoint, method, path, status, etag, stored, error])
+
+    def record_ws(self, event) -> None:
+        if not self.full:
+            self.events.append(["w", self._offset_ms(), event])
+
+    def record_connection(self, connected: bool) -> None:
+        if not self.full:
+            self.events.append(["c", self._offset_ms(), connected])
+
+    def header(self) -> dict:
+        return {
+            "format": TRAFFIC_FORMAT,
+            "version": TRAFFIC_VERSION,
+            "started": self.started.isoformat(),
+            "serial_number": self._serial_number,
+            "events": len(self.events),
+        }
+
+
+def write_traffic(path, header: dict, events) -> None:
+    """Write a recording; blocking, run it in the executor."""
+    with gzip.open(path, "wt", encoding="utf-8") as file:
+        file.write(json.dumps(header, separators=(",", ":")) + "\n")
+        for event in events:
+            file.write(json.dumps(event, separators=(",", ":")) + "\n")
+
+
+def read_traffic(path):
+    """Read a recording and return (header, events) with SAME_BODY markers resolved."""
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        header = json.loads(file.readline())
+        if header.get("format") != TRAFFIC_FORMAT:
+            raise ValueError(f"{path} is not a Wattrix traffic recording")
+        if header.get("version", 1) > TRAFFIC_VERSION:
+            raise ValueError(f"{path} has an unsupported recording version {header.get('version')}")
+        events = []
+        last_bodies = {}
+        for line in file:
+            event = json.loads(line)
+            if event[0] == "h":
+                path_key, body = event[4], event[7]
+                if body == SAME_BODY:
+                    event[7] = last_bodies.get(path_key)
+                elif body is not None:
+                    last_bodies[path_key] = body
+            events.append(event)
+    return header, events
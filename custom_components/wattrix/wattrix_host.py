@@ -1,60 +1,209 @@
+import asyncio
 import logging
+import time
+
+import async_timeout
 from homeassistant.helpers.update_coordinator import UpdateFailed
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
+
+from .circuit_breaker import WattrixCircuitBreaker
+from .connection import RequestTrace, request_deadline, request_timeout
+from .fleet import async_get_fleet
+from .metrics import WattrixMetrics
+from .traffic import request_key
 
 _LOGGER = logging.getLogger(__name__)
 
 class WattrixHost:
-    def __init__(self, hass, base_url: str):
+    def __init__(self, hass, base_url: str, fleet=None):
         self._base_url = base_url
-        self._session = async_get_clientsession(hass)
+        self._fleet = fleet or async_get_fleet(hass)
+        self.metrics = WattrixMetrics()
+        self.breaker = WattrixCircuitBreaker(base_url)
+        # Zariadenie obslúži len jedno spojenie naraz - requesty jedného hosta idú za sebou
+        self._lock = asyncio.Lock()
+        # WattrixTrafficRecorder počas nahrávania prevádzky
+        self.recorder = None
 
-    async def async_get_status(self):
+    async def _async_request(self, endpoint: str, method: str, path: str, *, params=None, headers=None, json=None,
+                             expected=(200,)):
+        """Run one request, record its metrics and return (status, headers, decoded JSON or None)."""
+        if not self.breaker.allow_request():
+            # Zariadenie je offline - nečakaj na timeout
+            raise UpdateFailed("Device is offline")
+        probe = False
+        try:
+            # Najprv poradie na zariadení, až potom slot fleetu - pomalé zariadenie nedrží sloty ostatných
+            async with self._lock, self._fleet.request_semaphore:
+                # Probe slot sa berie až tesne pred odoslaním
+                if not self.breaker.acquire():
+                    raise UpdateFailed("Device is offline")
+                probe = self.breaker.probing
+                # Deadline beží až od chvíle, keď request môže ísť na zariadenie
+                async with async_timeout.timeout(request_deadline(endpoint)):
+                    return await self._async_send(endpoint, method, path, params, headers, json, expected)
+        finally:
+            if probe:
+                # Probe zrušený pred odpoveďou nesmie nechať breaker v half_open
+                self.breaker.release_probe()
+
+    async def _async_send(self, endpoint, method, path, params, headers, json, expected):
+        metrics = self.metrics.get(endpoint)
+        started = time.monotonic()
+        trace = RequestTrace()
         try:
-            async with self._session.get(f"{self._base_url}/status") as resp:
-                if resp.status != 200:
+            async with self._fleet.session.request(method, f"{self._base_url}{path}", params=params, headers=headers, json=json,
+                                             timeout=request_timeout(endpoint), trace_request_ctx=trace) as resp:
+                body = await resp.read()
+                if self.recorder is not None:
+                    self.recorder.record_http(endpoint, method, request_key(path, params), resp.status, resp.headers.get("ETag"), body)
+                # Akákoľvek HTTP odpoveď znamená, že zariadenie je dostupné
+                self.breaker.record_success()
+                if resp.status not in expected:
                     raise UpdateFailed(f"HTTP {resp.status}")
-                return await resp.json()
+                data = json_loads(body) if body and resp.content_type == "application/json" else None
+        except asyncio.CancelledError:
+            # Request zrušil deadline koordinátora; zlyhaním zariadenia je len vtedy, keď už išiel na zariadenie
+            if not trace.connection_attempted:
+                metrics.record_error(time.monotonic() - started, "cancelled while waiting for a connection")
+                raise
+            metrics.record_error(time.monotonic() - started, "timeout", timeout=True)
+            self.breaker.record_failure()
+            if self.recorder is not None:
+                self.recorder.record_http(endpoint, method, request_key(path, params), None, None, None, "timeout")
+            raise
+        except UpdateFailed as e:
+            metrics.record_error(time.monotonic() - started, str(e))
+            raise
+        except Exception as e:
+            self.breaker.record_failure()
+            if self.recorder is not None:
+                self.recorder.record_http(endpoint, method, request_key(path, params), None, None, None, str(e))
+            metrics.record_error(time.monotonic() - started, str(e), timeout=isinstance(e, asyncio.TimeoutError))
+            raise
+
+        metrics.record_success(time.monotonic() - started, len(body), dt_util.utcnow())
+        return resp.status, resp.headers, data
+
+    async def async_get_status(self):
+        try:
+            _, _, data = await self._async_request("status", "GET", "/status")
+            return data
         except Exception as e:
             raise UpdateFailed(f"Failed to fetch status: {e}") from e
 
     async def async_get_sensor(self, sensor_id: str):
         try:
-            async with self._session.get(f"{self._base_url}/sensors/{sensor_id}") as resp:
-                if resp.status != 200:
-                    raise UpdateFailed(f"HTTP {resp.status}")
-                return await resp.json()
+            _, _, data = await self._async_request("sensors", "GET", f"/sensors/{sensor_id}")
+            return data
         except Exception as e:
-            _LOGGER.error(f"Failed to fetch sensor {sensor_id}: {e}")
+            _LOGGER.error("Failed to fetch sensor %s: %s", sensor_id, e)
             return None  # lepšie než {}
 
+    async def async_get_sensors(self, sensor_ids):
+        """Fetch several sensors in one request, None if the firmware does not support it."""
+        try:
+            status, _, data = await self._async_request(
+                "sensors", "GET", "/sensors", params={"ids": ",".join(sensor_ids)}, expected=(200, 404)
+            )
+        except Exception as e:
+            raise UpdateFailed(f"Failed to fetch sensors: {e}") from e
+        if status == 404:
+            return None
+
+        # Firmware vracia {"sensors": [{"id": ..., "value": ...}, ...]}
+        return {sensor.get("id"): sensor for sensor in (data or {}).get("sensors", [])}
+
+    async def async_get_energy_history(self, since, cursor=None, limit: int = 1000):
+        """Fetch one page of stored counter readings, None if the firmware keeps no history.
+
+        The firmware answers {"entries": [{"t": ..., "energy_total_kwh": ...}], "next_cursor": ...}
+        with entries in ascending time order.
+        """
+        params = {"since": since.isoformat(), "limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        try:
+            status, _, data = await self._async_request(
+                "history", "GET", "/history/energy", params=params, headers={"Accept-Encoding": "gzip"},
+                expected=(200, 404),
+            )
+        except Exception as e:
+            raise UpdateFailed(f"Failed to fetch energy history: {e}") from e
+        if status == 404:
+            return None
+        return data or {}
+
     async def async_get_serial_number(self):
         try:
-            async with self._session.get(f"{self._base_url}/serial-number") as resp:
-                if resp.status != 200:
-                    raise UpdateFailed(f"HTTP {resp.status}")
-                return await resp.json()
+            _, _, data = await self._async_request("serial_number", "GET", "/serial-number")
+            return data
         except Exception as e:
             raise UpdateFailed(f"Failed to fetch serial number: {e}") from e
 
     async def async_get_version(self):
         try:
-            async with self._session.get(f"{self._base_url}/version") as resp:
-                if resp.status != 200:
-                    raise UpdateFailed(f"HTTP {resp.status}")
-                return await resp.json()
+            _, _, data = await self._async_request("version", "GET", "/version")
+            return data
         except Exception as e:
             raise UpdateFailed(f"Failed to fetch version: {e}") from e
 
+    async def async_probe(self) -> bool:
+        """Check reachability with the smallest request the device answers."""
+        try:
+            await self._async_request("probe", "GET", "/version")
+            return True
+        except Exception as e:
+            _LOGGER.debug("Wattrix probe failed: %s", e)
+            return False
+
     async def async_get_device_info(self):
         try:
-            async with self._session.get(f"{self._base_url}/device-info") as resp:
-                if resp.status != 200:
-                    raise UpdateFailed(f"HTTP {resp.status}")
-                return await resp.json()
+            _, _, data = await self._async_request("device_info", "GET", "/device-info")
+            return data
         except Exception as e:
             raise UpdateFailed(f"Failed to fetch device info: {e}") from e
 
+    async def async_get_bootstrap(self, identity=None):
+        """Fetch serial number, version, device info and status in one parallel round.
+
+        A cached identity (serial number and version) skips those two requests.
+        """
+        identity = identity or {}
+
+        async def _cached_or_fetch(endpoint, fetch):
+            if identity.get(endpoint) is not None:
+                return identity[endpoint]
+            return await fetch()
+
+        serial_number, version, device_info, status = await asyncio.gather(
+            _cached_or_fetch("serial_number", self.async_get_serial_number),
+            _cached_or_fetch("version", self.async_get_version),
+            self.async_get_device_info(),
+            self.async_get_status(),
+            return_exceptions=True,
+        )
+
+        # Bez serioveho cisla a statusu nemozeme pokracovat
+        for result in (serial_number, status):
+            if isinstance(result, Exception):
+                raise result
+        if isinstance(version, Exception):
+            _LOGGER.warning("Failed to fetch version during bootstrap: %s", version)
+            version = None
+        if isinstance(device_info, Exception):
+            _LOGGER.warning("Failed to fetch device info during bootstrap: %s", device_info)
+            device_info = None
+
+        return {
+            "serial_number": serial_number,
+            "version": version,
+            "device_info": device_info,
+            "status": status,
+            "identity_cached": [endpoint for endpoint in ("serial_number", "version") if identity.get(endpoint) is not None],
+        }
+
     async def async_set_mode(self, mode: str,
                              power_limit_percentage: float,
                              timeout_seconds: int,
@@ -63,6 +212,7 @@ class WattrixHost:
                              minimal_temperature=None,
                              temperature_recovery_delta=None
                              ):
+        """POST /mode; return the device state from the response ({} if it has none), None on failure."""
         payload = {
             "mode": mode,
             "power_limit_percentage": power_limit_percentage,
@@ -76,20 +226,35 @@ class WattrixHost:
             payload["setpoint"] = setpoint
 
         try:
-            async with self._session.post(f"{self._base_url}/mode", json=payload) as resp:
-                if resp.status != 200:
-                    raise UpdateFailed(f"HTTP {resp.status}")
-                _LOGGER.info(f"Mode set to {mode} with payload {payload}")
-                return True
+            _, _, data = await self._async_request("mode", "POST", "/mode", json=payload)
+            _LOGGER.info("Mode set to %s with payload %s", mode, payload)
+            return data if isinstance(data, dict) else {}
         except Exception as e:
-            _LOGGER.error(f"Failed to set mode: {e}")
-            return False
+            _LOGGER.error("Failed to set mode: %s", e)
+            return None
+
+    async def async_get_schedule(self, hours: int = 24, etag: str = None, since_revision=None):
+        """Fetch the schedule, None if it has not changed since the given ETag.
+
+        With since_revision the firmware may answer with only the changed slots
+        ({"revision": ..., "changed": [...], "removed": [...]}) instead of the full list.
+        """
+        params = {"hours": hours}
+        if since_revision is not None:
+            params["since_revision"] = since_revision
+        headers = {"Accept-Encoding": "gzip"}
+        if etag:
+            headers["If-None-Match"] = etag
 
-    async def async_get_schedule(self, hours: int = 24):
         try:
-            async with self._session.get(f"{self._base_url}/schedule?hours={hours}") as resp:
-                if resp.status != 200:
-                    raise UpdateFailed(f"HTTP {resp.status}")
-                return await resp.json()
+            status, resp_headers, data = await self._async_request(
+                "schedule", "GET", "/schedule", params=params, headers=headers, expected=(200, 304)
+            )
         except Exception as e:
             raise UpdateFailed(f"Failed to fetch schedule: {e}") from e
+        if status == 304:
+            return None
+
+        data = data or {}
+        data["etag"] = resp_headers.get("ETag")
+        return data
@@ -1,16 +1,164 @@
 import asyncio
-import websockets
 import json
+import logging
+import random
+
+import websockets
+from homeassistant.core import callback
+from homeassistant.util.json import json_loads
+
+from .const import WEBSOCKET_PORT, WEBSOCKET_RETRY_SECONDS
+
+_LOGGER = logging.getLogger(__name__)
+
+# Najviac toľko rôznych kľúčov čaká na spracovanie, ďalšie vytlačia najstarší
+MAX_PENDING_EVENTS = 32
+HEARTBEAT_INTERVAL = 20
+HEARTBEAT_TIMEOUT = 10
+RECONNECT_MIN_SECONDS = 1
+# Status pushe bez "type" sa zlučujú po jednotlivých poliach
+STATUS_KEY = "status"
+
 
 class WattrixWebSocketClient:
-    def __init__(self, hass, host, on_event_callback):
+    """Device websocket with reconnect, heartbeats and a bounded, coalescing event queue.
+
+    Messages are decoded as they arrive and parked per key: status pushes are
+    merged field by field, other events keyed by their "type" keep only the
+    latest one and the oldest of them is dropped when the queue is full. A
+    single consumer hands them to on_event_callback one at a time and yields
+    to the event loop in between, so a burst from the device costs at most
+    MAX_PENDING_EVENTS callbacks.
+    """
+
+    def __init__(self, hass, host, on_event_callback, on_connect_callback=None, on_disconnect_callback=None):
         self._host = host
         self._hass = hass
         self._on_event_callback = on_event_callback
+        self._on_connect_callback = on_connect_callback
+        self._on_disconnect_callback = on_disconnect_callback
+        self._ws = None
+        self._pending = {}
+        self._wakeup = asyncio.Event()
+        self.received = 0
+        self.processed = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.decode_errors = 0
+        self.reconnects = 0
+
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None
+
+    async def async_run(self) -> None:
+        """Keep the websocket connected until cancelled, backing off between attempts."""
+        consumer = self._hass.async_create_background_task(
+            self._async_consume(), name=f"wattrix websocket {self._host} events"
+        )
+        backoff = RECONNECT_MIN_SECONDS
+        try:
+            while True:
+                try:
+                    if await self.listen():
+                        backoff = RECONNECT_MIN_SECONDS
+                    _LOGGER.warning("Wattrix websocket closed, falling back to polling")
+                except asyncio.CancelledError:
+                    raise
+                except Exception as err:
+                    _LOGGER.warning("Wattrix websocket unavailable, falling back to polling: %s", err)
+
+                delay = backoff * random.uniform(0.8, 1.2)
+                backoff = min(backoff * 2, WEBSOCKET_RETRY_SECONDS)
+                await asyncio.sleep(delay)
+                self.reconnects += 1
+        finally:
+            consumer.cancel()
+
+    async def listen(self) -> bool:
+        """Read one connection until it closes; return True if it was established."""
+        uri = f"ws://{self._host}:{WEBSOCKET_PORT}"
+        async with websockets.connect(
+            uri, ping_interval=HEARTBEAT_INTERVAL, ping_timeout=HEARTBEAT_TIMEOUT, max_queue=MAX_PENDING_EVENTS
+        ) as ws:
+            self._ws = ws
+            try:
+                if self._on_connect_callback:
+                    self._on_connect_callback()
+                async for message in ws:
+                    self._enqueue(message)
+            except websockets.ConnectionClosed as err:
+                _LOGGER.debug("Wattrix websocket %s closed: %s", self._host, err)
+            finally:
+                self._ws = None
+                if self._on_disconnect_callback:
+                    self._on_disconnect_callback()
+        return True
+
+    @callback
+    def _enqueue(self, message) -> None:
+        self.received += 1
+        try:
+            event = json_loads(message)
+        except ValueError:
+            self.decode_errors += 1
+            _LOGGER.debug("Ignoring undecodable Wattrix websocket message: %.100s", message)
+            return
+
+        if isinstance(event, dict) and not event.get("type"):
+            key, data = STATUS_KEY, event.get("data", event)
+        else:
+            key, data = (event.get("type") if isinstance(event, dict) else None), event
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            if key == STATUS_KEY and isinstance(data, dict):
+                pending.update(data)
+            else:
+                self._pending[key] = data
+        else:
+            if len(self._pending) >= MAX_PENDING_EVENTS:
+                # Zahodí sa najstaršia čakajúca udalosť; zlúčený status sa nezahadzuje
+                oldest = next(pending_key for pending_key in self._pending if pending_key != STATUS_KEY)
+                del self._pending[oldest]
+                self.dropped += 1
+            self._pending[key] = dict(data) if key == STATUS_KEY and isinstance(data, dict) else data
+        self._wakeup.set()
+
+    async def _async_consume(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while self._pending:
+                key = next(iter(self._pending))
+                event = self._pending.pop(key)
+                try:
+                    await self._on_event_callback(event)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception("Error handling Wattrix websocket event")
+                self.processed += 1
+                # Medzi udalosťami pustí ostatné úlohy event loopu
+                await asyncio.sleep(0)
+
+    async def async_send(self, payload) -> bool:
+        """Send one JSON message; False when the socket is not connected."""
+        if self._ws is None:
+            return False
+        try:
+            await self._ws.send(json.dumps(payload))
+        except websockets.ConnectionClosed:
+            return False
+        return True
 
-    async def listen(self):
-        uri = f"ws://{self._host}:8765"
-        async with websockets.connect(uri) as ws:
-            async for message in ws:
-                data = json.loads(message)
-                self._hass.async_create_task(self._on_event_callback(data))
\ No newline at end of file
+    def as_dict(self) -> dict:
+        return {
+            "connected": self.connected,
+            "received": self.received,
+            "processed": self.processed,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "decode_errors": self.decode_errors,
+            "reconnects": self.reconnects,
+            "pending": len(self._pending),
+        }
@@ -0,0 +1,100 @@
+"""Tests of the per-device circuit breaker."""
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.wattrix.circuit_breaker import (
+    FAILURE_THRESHOLD,
+    PROBE_BACKOFF_MAX,
+    PROBE_BACKOFF_MIN,
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    WattrixCircuitBreaker,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    clock = FakeClock()
+    with patch("custom_components.wattrix.circuit_breaker.time") as time_mock:
+        time_mock.monotonic.side_effect = clock
+        yield clock
+
+
+def _open_breaker():
+    breaker = WattrixCircuitBreaker("wattrix.local")
+    for _ in range(FAILURE_THRESHOLD):
+        breaker.record_failure()
+    return breaker
+
+
+def test_opens_after_consecutive_failures_and_rejects_requests(clock):
+    breaker = WattrixCircuitBreaker("wattrix.local")
+    for _ in range(FAILURE_THRESHOLD - 1):
+        breaker.record_failure()
+    assert breaker.state == STATE_CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+    assert not breaker.allow_request()
+    assert breaker.rejected == 1
+    assert 0 < breaker.seconds_until_probe() <= PROBE_BACKOFF_MIN * 1.2
+
+
+def test_only_one_probe_goes_through_when_it_is_due(clock):
+    breaker = _open_breaker()
+    clock.now += PROBE_BACKOFF_MIN * 1.2
+
+    # Oba requesty prejdú kontrolou, slot však dostane len prvý
+    assert breaker.allow_request()
+    assert breaker.allow_request()
+    assert breaker.acquire()
+    assert breaker.probing
+    assert not breaker.acquire()
+    assert breaker.state == STATE_HALF_OPEN
+
+
+def test_released_probe_does_not_leave_the_breaker_half_open(clock):
+    breaker = _open_breaker()
+    clock.now += PROBE_BACKOFF_MIN * 1.2
+    assert breaker.acquire()
+
+    # Probe zrušený bez odpovede aj bez zlyhania
+    breaker.release_probe()
+    assert breaker.state == STATE_OPEN
+    assert breaker.seconds_until_probe() == 0
+    assert breaker.acquire()
+
+
+def test_failed_probe_backs_off_and_success_closes(clock):
+    breaker = _open_breaker()
+    for _ in range(10):
+        clock.now += PROBE_BACKOFF_MAX * 1.2
+        assert breaker.acquire()
+        breaker.record_failure()
+        assert breaker.state == STATE_OPEN
+    assert breaker.seconds_until_probe() <= PROBE_BACKOFF_MAX * 1.2
+
+    clock.now += PROBE_BACKOFF_MAX * 1.2
+    assert breaker.acquire()
+    breaker.record_success()
+    assert breaker.state == STATE_CLOSED
+    assert breaker.consecutive_failures == 0
+    assert breaker.acquire()
+    assert not breaker.probing
+
+
+def test_closed_breaker_ignores_release_probe(clock):
+    breaker = WattrixCircuitBreaker("wattrix.local")
+    assert breaker.acquire()
+    breaker.release_probe()
+    assert breaker.state == STATE_CLOSED
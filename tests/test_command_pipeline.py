@@ -0,0 +1,130 @@
+"""Tests of the debounced mode command pipeline; run with pytest-homeassistant-custom-component installed."""
+import asyncio
+from datetime import timedelta
+
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.wattrix.command_pipeline import COMMAND_DEBOUNCE_SECONDS, WattrixCommandPipeline
+from custom_components.wattrix.metrics import WattrixMetrics
+
+
+class FakeHost:
+    def __init__(self, response=None):
+        self.metrics = WattrixMetrics()
+        self.calls = []
+        self.response = {"mode": "TOTAL_STOP"} if response is None else response
+        # Kým nie je nastavený, POST /mode visí
+        self.released = asyncio.Event()
+        self.released.set()
+
+    async def async_set_mode(self, **payload):
+        self.calls.append(payload)
+        await self.released.wait()
+        return self.response
+
+
+class FakeCoordinator:
+    def __init__(self):
+        self.push_connected = False
+        self.data = {}
+        self.applied = []
+        self.refreshed = asyncio.Event()
+        self.refreshed.set()
+
+    def async_boost_polling(self):
+        pass
+
+    def async_apply_status(self, state):
+        self.applied.append(state)
+        self.data = {**self.data, **state}
+
+    async def async_request_refresh(self):
+        await self.refreshed.wait()
+        self.data = {**self.data, "mode": "UNRESTRICTED_HEATING"}
+
+
+async def _settle():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+async def _fire_debounce(hass):
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=COMMAND_DEBOUNCE_SECONDS + 0.1))
+    await _settle()
+
+
+async def test_changes_within_the_debounce_window_are_sent_once(hass):
+    host, coordinator = FakeHost(), FakeCoordinator()
+    pipeline = WattrixCommandPipeline(hass, host, coordinator)
+
+    first = asyncio.create_task(pipeline.async_set_mode(mode="TOTAL_STOP", setpoint=200))
+    second = asyncio.create_task(pipeline.async_set_mode(setpoint=500))
+    await _settle()
+    assert host.calls == []
+
+    await _fire_debounce(hass)
+    assert await first is True
+    assert await second is True
+    # Posledná zmena poľa vyhráva
+    assert host.calls == [{"mode": "TOTAL_STOP", "setpoint": 500}]
+    assert coordinator.applied == [{"mode": "TOTAL_STOP"}]
+    assert host.metrics.get("mode_confirm").requests == 1
+
+
+async def test_command_submitted_during_a_post_is_sent_after_it(hass):
+    host, coordinator = FakeHost(), FakeCoordinator()
+    pipeline = WattrixCommandPipeline(hass, host, coordinator)
+    host.released.clear()
+
+    first = asyncio.create_task(pipeline.async_set_mode(mode="TOTAL_STOP"))
+    await _settle()
+    await _fire_debounce(hass)
+    assert host.calls == [{"mode": "TOTAL_STOP"}]
+
+    second = asyncio.create_task(pipeline.async_set_mode(mode="UNRESTRICTED_HEATING"))
+    await _settle()
+    # Počas odosielania sa druhý POST nezačne ani po uplynutí debounce
+    await _fire_debounce(hass)
+    assert len(host.calls) == 1
+
+    host.released.set()
+    assert await first is True
+    await _fire_debounce(hass)
+    assert await second is True
+    assert host.calls == [{"mode": "TOTAL_STOP"}, {"mode": "UNRESTRICTED_HEATING"}]
+
+
+async def test_confirmation_runs_after_the_callers_are_released(hass):
+    host, coordinator = FakeHost(response={}), FakeCoordinator()
+    pipeline = WattrixCommandPipeline(hass, host, coordinator)
+    coordinator.refreshed.clear()
+
+    waiter = asyncio.create_task(pipeline.async_set_mode(mode="UNRESTRICTED_HEATING"))
+    await _settle()
+    await _fire_debounce(hass)
+    # Odpoveď bez režimu - volajúci nečaká na potvrdzovací refresh
+    assert await waiter is True
+    assert host.metrics.get("mode_confirm").requests == 0
+
+    coordinator.refreshed.set()
+    await hass.async_block_till_done()
+    assert host.metrics.get("mode_confirm").requests == 1
+
+
+async def test_failed_post_and_shutdown_resolve_callers_with_false(hass):
+    host, coordinator = FakeHost(), FakeCoordinator()
+    pipeline = WattrixCommandPipeline(hass, host, coordinator)
+
+    host.response = None
+    failed = asyncio.create_task(pipeline.async_set_mode(mode="TOTAL_STOP"))
+    await _settle()
+    await _fire_debounce(hass)
+    assert await failed is False
+
+    pending = asyncio.create_task(pipeline.async_set_mode(mode="TOTAL_STOP"))
+    await _settle()
+    pipeline.async_shutdown()
+    assert await pending is False
+    await _fire_debounce(hass)
+    assert len(host.calls) == 1
@@ -0,0 +1,76 @@
+"""Tests of the hourly energy integration; run with pytest-homeassistant-custom-component installed."""
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.wattrix.energy import WattrixEnergyIntegrator, energy_statistic_id
+
+START = datetime(2026, 1, 1, 10, 0, tzinfo=timezone.utc)
+
+
+class FakeCoordinator:
+    def __init__(self):
+        self.last_update_success = True
+        self.restored = False
+        self.stale_keys = set()
+        self.data = {}
+
+    def async_add_listener(self, listener, context=None):
+        return lambda: None
+
+
+def _sample(integrator, coordinator, moment, power, total):
+    coordinator.data = {"active_power": power, "energy_total_kwh": total}
+    with patch("custom_components.wattrix.energy.dt_util.utcnow", return_value=moment):
+        integrator._async_sample()
+
+
+def _integrator():
+    coordinator = FakeCoordinator()
+    integrator = WattrixEnergyIntegrator(None, coordinator)
+    integrator.async_set_statistic(energy_statistic_id("WX-1"), "Integrated")
+    return integrator, coordinator
+
+
+def test_interval_split_at_hour_boundary():
+    energy = WattrixEnergyIntegrator._integrate(
+        START + timedelta(minutes=55), 1000.0, START + timedelta(minutes=65), 3000.0
+    )
+    # Výkon na hranici je interpolovaný na 2000 W
+    assert energy[START] == pytest.approx(1500 * 5 / 60 / 1000)
+    assert energy[START + timedelta(hours=1)] == pytest.approx(2500 * 5 / 60 / 1000)
+
+
+def test_gap_longer_than_max_is_not_integrated():
+    assert WattrixEnergyIntegrator._integrate(START, 1000.0, START + timedelta(minutes=30), 1000.0) == {}
+
+
+def test_every_closed_hour_is_imported():
+    integrator, coordinator = _integrator()
+    with patch("custom_components.wattrix.energy.async_import_energy") as import_energy:
+        for minute in range(0, 3 * 60 + 1):
+            _sample(integrator, coordinator, START + timedelta(minutes=minute), 1000.0, 100.0 + minute / 60)
+
+    rows = [row for call in import_energy.call_args_list for row in call.args[2]]
+    # Externá štatistika, nie štatistika entity bez state_class
+    assert import_energy.call_args.args[1]["statistic_id"] == "wattrix:wx_1_energy"
+    assert import_energy.call_args.args[1]["source"] == "wattrix"
+    assert [start for start, _sum in rows] == [START, START + timedelta(hours=1), START + timedelta(hours=2)]
+    assert rows[-1][1] == pytest.approx(103.0)
+    assert integrator.pending_hours == 0
+    assert integrator.last_drift_kwh == pytest.approx(0.0, abs=1e-6)
+
+
+def test_closed_hour_is_reconciled_with_device_counter():
+    integrator, coordinator = _integrator()
+    with patch("custom_components.wattrix.energy.async_import_energy") as import_energy:
+        # Zariadenie hlási 0 W, ale počítadlo rastie o 3 kWh za hodinu
+        for minute in range(0, 3 * 60 + 1):
+            _sample(integrator, coordinator, START + timedelta(minutes=minute), 0.0, 100.0 + minute * 3 / 60)
+
+    rows = [row for call in import_energy.call_args_list for row in call.args[2]]
+    assert len(rows) == 3
+    assert rows[-1][1] == pytest.approx(109.0)
+    assert integrator.last_drift_kwh == pytest.approx(3.0)
+    assert integrator.total_kwh == pytest.approx(109.0)
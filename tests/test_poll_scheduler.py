@@ -0,0 +1,74 @@
+"""Tests of the per-endpoint poll scheduler."""
+from datetime import datetime, timedelta, timezone
+
+from custom_components.wattrix.poll_scheduler import (
+    COALESCE_WINDOW,
+    IDLE_WAKEUP,
+    MIN_WAKEUP,
+    STAGGER_STEP,
+    WattrixPollScheduler,
+)
+
+NOW = datetime(2026, 1, 1, 10, 0, tzinfo=timezone.utc)
+
+
+def _scheduler(phase=timedelta(0)):
+    scheduler = WattrixPollScheduler(phase)
+    scheduler.add("status", timedelta(seconds=10), NOW)
+    scheduler.add("sensors", timedelta(seconds=30), NOW)
+    scheduler.add("schedule", timedelta(minutes=5), NOW)
+    return scheduler
+
+
+def test_first_polls_are_staggered_and_shifted_by_the_phase():
+    scheduler = _scheduler(phase=timedelta(seconds=3))
+    assert scheduler.get("status").next_due == NOW + timedelta(seconds=3)
+    assert scheduler.get("sensors").next_due == NOW + timedelta(seconds=3) + STAGGER_STEP
+    assert scheduler.get("schedule").next_due == NOW + timedelta(seconds=3) + 2 * STAGGER_STEP
+
+
+def test_endpoints_due_within_the_window_are_polled_together():
+    scheduler = _scheduler()
+    due = [endpoint.name for endpoint in scheduler.due(NOW + STAGGER_STEP - COALESCE_WINDOW)]
+    assert due == ["status", "sensors"]
+
+
+def test_mark_polled_keeps_the_phase_unless_the_endpoint_fell_behind():
+    scheduler = _scheduler()
+    # Poll o sekundu neskôr - ďalší termín ostáva na pôvodnej mriežke
+    scheduler.mark_polled("status", NOW + timedelta(seconds=1))
+    assert scheduler.get("status").next_due == NOW + timedelta(seconds=10)
+
+    # Poll až po ďalšom termíne - mriežka sa posunie od času pollu
+    late = NOW + timedelta(seconds=25)
+    scheduler.mark_polled("status", late)
+    assert scheduler.get("status").next_due == late + timedelta(seconds=10)
+
+
+def test_shorter_interval_pulls_the_next_poll_forward():
+    scheduler = _scheduler()
+    scheduler.mark_polled("sensors", NOW + STAGGER_STEP)
+    assert scheduler.get("sensors").next_due == NOW + STAGGER_STEP + timedelta(seconds=30)
+
+    now = NOW + timedelta(seconds=5)
+    scheduler.set_interval("sensors", timedelta(seconds=5), now)
+    assert scheduler.get("sensors").next_due == now + timedelta(seconds=5)
+
+
+def test_paused_endpoints_are_neither_due_nor_woken_up_for():
+    scheduler = _scheduler()
+    scheduler.pause("status")
+    assert "status" not in [endpoint.name for endpoint in scheduler.due(NOW)]
+    assert scheduler.next_wakeup(NOW) == STAGGER_STEP
+
+    for name in ("sensors", "schedule"):
+        scheduler.pause(name)
+    assert scheduler.next_wakeup(NOW) == IDLE_WAKEUP
+
+    scheduler.resume("schedule", NOW + timedelta(seconds=40))
+    assert [endpoint.name for endpoint in scheduler.due(NOW + timedelta(seconds=40))] == ["schedule"]
+
+
+def test_next_wakeup_never_goes_below_the_minimum():
+    scheduler = _scheduler()
+    assert scheduler.next_wakeup(NOW + timedelta(minutes=1)) == MIN_WAKEUP
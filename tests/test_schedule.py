@@ -0,0 +1,56 @@
+"""Tests of the bisectable schedule index."""
+from datetime import datetime, timedelta, timezone
+
+from custom_components.wattrix.schedule import WattrixScheduleIndex
+
+START = datetime(2026, 1, 1, 10, 0, tzinfo=timezone.utc)
+
+
+def _slot(mode, start_hours, end_hours=None):
+    slot = {"mode": mode, "start": (START + timedelta(hours=start_hours)).isoformat()}
+    if end_hours is not None:
+        slot["end"] = (START + timedelta(hours=end_hours)).isoformat()
+    return slot
+
+
+def test_slot_starts_inclusive_and_ends_exclusive():
+    first, second = _slot("EXPORT_SURPLUS_HEATING", 0, 1), _slot("TOTAL_STOP", 1, 2)
+    # Zariadenie môže poslať sloty v ľubovoľnom poradí
+    index = WattrixScheduleIndex([second, first])
+
+    assert index.current_slot(START - timedelta(seconds=1)) is None
+    assert index.current_slot(START) is first
+    assert index.current_slot(START + timedelta(hours=1)) is second
+    assert index.next_slot(START + timedelta(minutes=30)) is second
+    assert index.current_slot(START + timedelta(hours=2)) is None
+    assert index.next_slot(START + timedelta(hours=2)) is None
+
+
+def test_long_slot_is_current_again_after_a_shorter_overlapping_slot():
+    long_slot, short_slot = _slot("SOLAR_AND_GRID_HEATING", 0, 4), _slot("TOTAL_STOP", 1, 2)
+    index = WattrixScheduleIndex([long_slot, short_slot])
+
+    assert index.current_slot(START + timedelta(hours=1, minutes=30)) is short_slot
+    assert index.current_slot(START + timedelta(hours=3)) is long_slot
+
+
+def test_next_boundary_walks_starts_and_ends_and_skips_open_ends():
+    index = WattrixScheduleIndex([_slot("TOTAL_STOP", 0, 1), _slot("DISABLED_HEATING", 3)])
+
+    assert index.next_boundary(START - timedelta(minutes=1)) == START
+    assert index.next_boundary(START) == START + timedelta(hours=1)
+    assert index.next_boundary(START + timedelta(hours=1)) == START + timedelta(hours=3)
+    # Slot bez konca beží, kým ho rozvrh nenahradí
+    assert index.next_boundary(START + timedelta(hours=3)) is None
+    assert index.current_slot(START + timedelta(days=30))["mode"] == "DISABLED_HEATING"
+
+
+def test_upcoming_count_and_unparsable_slots():
+    index = WattrixScheduleIndex([
+        _slot("TOTAL_STOP", 0, 1), _slot("TOTAL_STOP", 2, 3), {"mode": "TOTAL_STOP", "start": "not a time"},
+    ])
+
+    assert len(index) == 2
+    assert index.upcoming_count(START) == 2
+    assert index.upcoming_count(START + timedelta(hours=1)) == 1
+    assert index.upcoming_count(START + timedelta(hours=3)) == 0
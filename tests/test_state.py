@@ -0,0 +1,34 @@
+"""Tests of the immutable device snapshot."""
+import pytest
+
+from custom_components.wattrix.state import WattrixSnapshot
+
+
+def test_replace_without_a_difference_returns_the_same_snapshot():
+    snapshot = WattrixSnapshot({"mode": "TOTAL_STOP", "active_power": 0})
+    assert snapshot.replace({"mode": "TOTAL_STOP"}) is snapshot
+    assert snapshot.replace({}) is snapshot
+
+
+def test_replace_returns_a_new_snapshot_and_keeps_the_old_one():
+    snapshot = WattrixSnapshot({"mode": "TOTAL_STOP", "active_power": 0})
+    updated = snapshot.replace({"active_power": 1500})
+    assert updated is not snapshot
+    assert updated["active_power"] == 1500
+    assert snapshot["active_power"] == 0
+    with pytest.raises(AttributeError):
+        snapshot.extra = 1
+
+
+def test_changed_keys_covers_changed_added_and_removed_keys():
+    previous = WattrixSnapshot({"mode": "TOTAL_STOP", "active_power": 0, "setpoint": 200})
+    current = WattrixSnapshot({"mode": "TOTAL_STOP", "active_power": 800, "heating_state": True})
+    assert current.changed_keys(previous) == {"active_power", "heating_state", "setpoint"}
+
+
+def test_unchanged_snapshot_has_no_changed_keys():
+    snapshot = WattrixSnapshot({"mode": "TOTAL_STOP"})
+    assert snapshot.changed_keys(snapshot) == set()
+    assert snapshot.replace({"mode": "TOTAL_STOP"}).changed_keys(snapshot) == set()
+    # Rovnaké hodnoty v inom objekte sa porovnajú po kľúčoch
+    assert WattrixSnapshot({"mode": "TOTAL_STOP"}).changed_keys(snapshot) == set()
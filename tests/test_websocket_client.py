@@ -0,0 +1,65 @@
+"""Tests of the websocket client's bounded, coalescing event queue."""
+import asyncio
+import json
+
+from custom_components.wattrix.websocket_client import MAX_PENDING_EVENTS, STATUS_KEY, WattrixWebSocketClient
+
+
+def _client(events=None):
+    async def _on_event(event):
+        events.append(event)
+
+    return WattrixWebSocketClient(None, "wattrix.local", _on_event)
+
+
+def test_status_pushes_are_merged_and_typed_events_keep_the_latest():
+    client = _client()
+    client._enqueue(json.dumps({"active_power": 100, "mode": "TOTAL_STOP"}))
+    client._enqueue(json.dumps({"data": {"active_power": 200}}))
+    client._enqueue(json.dumps({"type": "setpoint_ack", "seq": 1}))
+    client._enqueue(json.dumps({"type": "setpoint_ack", "seq": 2}))
+    client._enqueue("{not json")
+
+    assert client._pending == {
+        STATUS_KEY: {"active_power": 200, "mode": "TOTAL_STOP"},
+        "setpoint_ack": {"type": "setpoint_ack", "seq": 2},
+    }
+    assert client.received == 5
+    assert client.coalesced == 2
+    assert client.decode_errors == 1
+    assert client.dropped == 0
+
+
+def test_full_queue_drops_the_oldest_event_but_never_the_status():
+    client = _client()
+    client._enqueue(json.dumps({"active_power": 100}))
+    for number in range(MAX_PENDING_EVENTS):
+        client._enqueue(json.dumps({"type": f"event_{number}"}))
+
+    assert len(client._pending) == MAX_PENDING_EVENTS
+    assert client.dropped == 1
+    assert STATUS_KEY in client._pending
+    assert "event_0" not in client._pending
+    assert f"event_{MAX_PENDING_EVENTS - 1}" in client._pending
+
+    # Ďalší status sa zlúči, nič nevytlačí
+    client._enqueue(json.dumps({"mode": "TOTAL_STOP"}))
+    assert client.dropped == 1
+    assert client._pending[STATUS_KEY] == {"active_power": 100, "mode": "TOTAL_STOP"}
+
+
+async def test_burst_is_handed_over_as_one_merged_status():
+    events = []
+    client = _client(events)
+    for power in range(100):
+        client._enqueue(json.dumps({"active_power": power}))
+    client._enqueue(json.dumps({"type": "setpoint_ack", "seq": 1}))
+
+    consumer = asyncio.create_task(client._async_consume())
+    for _ in range(10):
+        await asyncio.sleep(0)
+    consumer.cancel()
+
+    assert events == [{"active_power": 99}, {"type": "setpoint_ack", "seq": 1}]
+    assert client.processed == 2
+    assert client.as_dict()["pending"] == 0